@@ -0,0 +1,43 @@
+import asyncio
+import random
+from typing import Iterable, List, Optional, Set, Tuple
+from paradex_account import ParadexAccount
+
+
+class AccountLeaseManager:
+    """Guarantees an account is only used by one in-flight pair at a time."""
+
+    def __init__(self, accounts: List[ParadexAccount]):
+        self.accounts = accounts
+        self._leased: Set[int] = set()
+        self._condition = asyncio.Condition()
+
+    def _free_accounts(self) -> List[ParadexAccount]:
+        return [account for account in self.accounts if account.account.address not in self._leased]
+
+    async def acquire_pair(self, timeout: Optional[float] = None) -> Optional[Tuple[ParadexAccount, ParadexAccount]]:
+        async with self._condition:
+            try:
+                await asyncio.wait_for(
+                    self._condition.wait_for(lambda: len(self._free_accounts()) >= 2),
+                    timeout=timeout
+                )
+            except asyncio.TimeoutError:
+                return None
+            long_account, short_account = random.sample(self._free_accounts(), 2)
+            self._leased.add(long_account.account.address)
+            self._leased.add(short_account.account.address)
+            return long_account, short_account
+
+    def try_acquire(self, accounts: Iterable[ParadexAccount]) -> bool:
+        addresses = {account.account.address for account in accounts}
+        if addresses & self._leased:
+            return False
+        self._leased |= addresses
+        return True
+
+    async def release(self, accounts: Iterable[ParadexAccount]) -> None:
+        async with self._condition:
+            for account in accounts:
+                self._leased.discard(account.account.address)
+            self._condition.notify_all()
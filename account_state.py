@@ -0,0 +1,130 @@
+import asyncio
+import logging
+import time
+from typing import Dict, List, Optional
+from paradex_account import ParadexAccount
+from paradex_api_client import ParadexAPIClient
+from order_index import OrderIndex
+from shared.paradex_api_utils import WSSubscription
+from ws_client import ParadexWSClient
+
+WS_CHANNELS = {
+    WSSubscription.ACCOUNT_SUMMARY: "account",
+    WSSubscription.BALANCES: "balance_events",
+    WSSubscription.POSITIONS: "positions",
+    WSSubscription.ORDERS: "orders.ALL",
+}
+
+
+class AccountSnapshot:
+    __slots__ = ("balances", "positions", "summary", "synced", "updated_at")
+
+    def __init__(self):
+        self.balances: Dict[str, float] = {}
+        self.positions: Dict[str, Dict] = {}
+        self.summary: Dict = {}
+        self.synced = False
+        self.updated_at = 0.0
+
+
+class AccountStream(ParadexWSClient):
+    def __init__(
+            self,
+            ws_url: str,
+            account: ParadexAccount,
+            api_client: ParadexAPIClient,
+            order_index: Optional[OrderIndex] = None,
+            snapshot_semaphore: Optional[asyncio.Semaphore] = None,
+            **kwargs
+    ):
+        super().__init__(ws_url, **kwargs)
+        self.account = account
+        self.api_client = api_client
+        self.order_index = order_index
+        # Shared by all streams, bounds the REST resyncs after a fleet-wide reconnect or at bootstrap
+        self.snapshot_semaphore = snapshot_semaphore or asyncio.Semaphore(1)
+        self.snapshot = AccountSnapshot()
+
+    def channels(self) -> List[str]:
+        return list(WS_CHANNELS.values())
+
+    def auth_token(self) -> Optional[str]:
+        return self.account.jwt
+
+    async def on_subscribed(self) -> None:
+        # Updates pushed while we were disconnected are lost, so take a REST snapshot on every (re)connect
+        async with self.snapshot_semaphore:
+            balances, positions = await asyncio.gather(
+                self.api_client.get_balance(self.account.jwt),
+                self.api_client.get_positions(self.account.jwt),
+            )
+        self.snapshot.balances = {item["token"]: float(item["size"]) for item in balances}
+        self.snapshot.positions = {position["market"]: position for position in positions}
+        self.snapshot.synced = True
+        self.snapshot.updated_at = time.monotonic()
+        logging.debug(f"Synced account state for {hex(self.account.account.address)}")
+
+    async def on_disconnect(self) -> None:
+        self.snapshot.synced = False
+
+    async def on_message(self, channel: str, data: Dict) -> None:
+        if channel == WS_CHANNELS[WSSubscription.POSITIONS]:
+            self.snapshot.positions[data["market"]] = data
+        elif channel == WS_CHANNELS[WSSubscription.BALANCES]:
+            if data.get("settlement_asset_balance_after") is not None:
+                self.snapshot.balances["USDC"] = float(data["settlement_asset_balance_after"])
+        elif channel == WS_CHANNELS[WSSubscription.ACCOUNT_SUMMARY]:
+            self.snapshot.summary = data
+        elif channel == WS_CHANNELS[WSSubscription.ORDERS]:
+            if self.order_index:
+                self.order_index.on_order_update(data)
+            return
+        self.snapshot.updated_at = time.monotonic()
+
+
+class AccountStateEngine:
+    def __init__(
+            self,
+            ws_url: str,
+            api_client: ParadexAPIClient,
+            order_index: Optional[OrderIndex] = None,
+            snapshot_concurrency: int = 20,
+            **ws_kwargs
+    ):
+        self.ws_url = ws_url
+        self.api_client = api_client
+        self.order_index = order_index
+        self.snapshot_semaphore = asyncio.Semaphore(snapshot_concurrency)
+        self.ws_kwargs = ws_kwargs
+        self._streams: Dict[int, AccountStream] = {}
+
+    def add_account(self, account: ParadexAccount) -> None:
+        address = account.account.address
+        if address in self._streams:
+            return
+        stream = AccountStream(
+            self.ws_url, account, self.api_client, self.order_index, self.snapshot_semaphore, **self.ws_kwargs
+        )
+        self._streams[address] = stream
+        stream.start()
+
+    async def stop(self) -> None:
+        await asyncio.gather(*[stream.stop() for stream in self._streams.values()])
+
+    def get_snapshot(self, account: ParadexAccount) -> Optional[AccountSnapshot]:
+        stream = self._streams.get(account.account.address)
+        if stream is None or not stream.snapshot.synced:
+            return None
+        return stream.snapshot
+
+    async def get_usdc_balance(self, account: ParadexAccount) -> float:
+        snapshot = self.get_snapshot(account)
+        if snapshot:
+            return snapshot.balances.get("USDC", 0.0)
+        return await self.api_client.get_free_collateral(account.jwt)
+
+    async def get_positions(self, account: ParadexAccount) -> List[Dict]:
+        snapshot = self.get_snapshot(account)
+        if snapshot:
+            return list(snapshot.positions.values())
+        return await self.api_client.get_positions(account.jwt)
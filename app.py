@@ -16,7 +16,9 @@ def read_private_keys(file_path: str) -> str:
         # Strip whitespace and newline characters from each line
         return [line.strip() for line in file.readlines() if line.strip()]
 
-def signal_handler(shutdown_event):
+def signal_handler(bot, shutdown_event):
+    if bot.shutdown_requested_at is None:
+        bot.shutdown_requested_at = asyncio.get_running_loop().time()
     shutdown_event.set()
 
 async def main():
@@ -33,7 +35,21 @@ async def main():
         paradex_http_url=config['paradex_http_url'],
         markets=config['markets'],
         order_size_range=config['order_size_range'],
-        cool_down_time_seconds_between_orders_range=config['cool_down_time_seconds_between_orders_range']
+        cool_down_time_seconds_between_orders_range=config['cool_down_time_seconds_between_orders_range'],
+        http_pool_config=config.get('http_pool'),
+        jwt_refresh_margin_seconds=config.get('jwt_refresh_margin_seconds', 60),
+        key_derivation_workers=config.get('key_derivation_workers'),
+        auth_concurrency=config.get('auth_concurrency', 20),
+        key_cache_path=config.get('key_cache_path', '.key_cache'),
+        paradex_ws_url=config.get('paradex_ws_url'),
+        bbo_max_age_seconds=config.get('bbo_max_age_seconds', 5),
+        pair_workers=config.get('pair_workers', 1),
+        markets_ttl_seconds=config.get('markets_ttl_seconds', 300),
+        signing_pool_config=config.get('signing_pool'),
+        prefetch_next_pair=config.get('prefetch_next_pair', True),
+        cleanup_concurrency=config.get('cleanup_concurrency', 20),
+        cleanup_deadline_seconds=config.get('cleanup_deadline_seconds', 8),
+        pair_ttl_seconds=config.get('pair_ttl_seconds', 3600)
     )
     await bot.setup()
     await bot.setup_accounts(private_keys)
@@ -43,7 +59,7 @@ async def main():
     # Set up signal handlers
     loop = asyncio.get_running_loop()
     for sig in (signal.SIGINT, signal.SIGTERM, signal.SIGQUIT):
-        loop.add_signal_handler(sig, shutdown_event.set)
+        loop.add_signal_handler(sig, signal_handler, bot, shutdown_event)
 
     try:
         await bot.run(shutdown_event)
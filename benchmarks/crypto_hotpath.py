@@ -0,0 +1,156 @@
+"""
+Microbenchmarks for the hashing and signing functions on the order path. Runs offline
+on fixed keys and messages and writes JSON, so two runs can be compared directly.
+
+    python -m benchmarks.crypto_hotpath --output before.json
+    python -m benchmarks.crypto_hotpath --baseline before.json --tolerance 0.1
+
+Each case also records a digest of its result: a changed digest means the function no
+longer computes the same value, whatever its speed.
+"""
+import argparse
+import hashlib
+import json
+import platform
+import statistics
+import sys
+import time
+import timeit
+from decimal import Decimal
+from importlib import metadata
+from typing import Callable, Dict, List, Tuple
+
+from helpers.typed_data import get_template
+from helpers.utils import compute_hash_on_elements, generate_k_rfc6979, message_signature, pedersen_hash
+from order_manager import order_message, order_sign_message, sign_order
+from shared.paradex_api_utils import Order, OrderSide, OrderType
+from utils import get_signer_account, grind_key, int_from_bytes
+from starknet_py.constants import EC_ORDER
+from starknet_py.utils.typed_data import TypedData
+
+CHAIN_ID = int_from_bytes(b"PRIVATE_SN_POTC_SEPOLIA")
+ACCOUNT_ADDRESS = 0x129F3DC1B8962D8A87ABC692424C78FDA963ADE0E1C6BE7E8D2F1E8C1E5B7C1
+PRIVATE_KEY = 0x3C1E9550E66958296D11B60F8E8E7A7AD990D07FA65D5F7652C4A6C87D4E3CC
+# r of a fixed ETH signature, the input grind_key sees during key derivation
+GRIND_SEED = 0x21FBF0696D5E0AA2EF41A2B4FFB623BCAF070461D61CF7251C74161F82FEC3A4
+ORDER = Order(
+    market="BTC-USD-PERP",
+    order_type=OrderType.Market,
+    order_side=OrderSide.Buy,
+    size=Decimal("0.125"),
+    signature_timestamp=1_700_000_000_000,
+)
+PACKAGES = ("starknet-py", "starknet-crypto-py", "eth-account")
+
+
+def build_cases() -> List[Tuple[str, Callable]]:
+    typed_data = order_sign_message(CHAIN_ID, ORDER)
+    typed_data_dataclass = TypedData.from_dict(typed_data)
+    template = get_template("Order", CHAIN_ID)
+    message = order_message(ORDER)
+    msg_hash = typed_data_dataclass.message_hash(ACCOUNT_ADDRESS)
+    elements = list(range(1, 9))
+    account = get_signer_account(
+        hex(ACCOUNT_ADDRESS), hex(PRIVATE_KEY), {"starknet_chain_id": "PRIVATE_SN_POTC_SEPOLIA"}
+    )
+    return [
+        ("pedersen_hash", lambda: pedersen_hash(ACCOUNT_ADDRESS, PRIVATE_KEY)),
+        ("compute_hash_on_elements", lambda: compute_hash_on_elements(elements)),
+        ("typed_data.message_hash", lambda: typed_data_dataclass.message_hash(ACCOUNT_ADDRESS)),
+        ("template.message_hash", lambda: template.message_hash(ACCOUNT_ADDRESS, message)),
+        ("generate_k_rfc6979", lambda: generate_k_rfc6979(msg_hash, PRIVATE_KEY)),
+        ("message_signature", lambda: message_signature(msg_hash, PRIVATE_KEY)),
+        ("grind_key", lambda: grind_key(GRIND_SEED, EC_ORDER)),
+        ("order_sign_message", lambda: order_sign_message(CHAIN_ID, ORDER)),
+        ("sign_order", lambda: sign_order(CHAIN_ID, account, ORDER)),
+    ]
+
+
+def result_digest(value) -> str:
+    return hashlib.sha256(json.dumps(value, sort_keys=True, default=str).encode()).hexdigest()[:16]
+
+
+def measure(fn: Callable, repeat: int, min_time: float) -> Dict:
+    timer = timeit.Timer(fn)
+    number, _ = timer.autorange()
+    number = max(1, int(number * min_time / 0.2))
+    timings = [elapsed / number for elapsed in timer.repeat(repeat=repeat, number=number)]
+    return {
+        "number": number,
+        "repeat": repeat,
+        "median_ns": statistics.median(timings) * 1e9,
+        "min_ns": min(timings) * 1e9,
+        "ops_per_sec": 1 / statistics.median(timings),
+        "result": result_digest(fn()),
+    }
+
+
+def environment() -> Dict:
+    versions = {}
+    for package in PACKAGES:
+        try:
+            versions[package] = metadata.version(package)
+        except metadata.PackageNotFoundError:
+            versions[package] = None
+    return {
+        "python": sys.version.split()[0],
+        "implementation": platform.python_implementation(),
+        "machine": platform.machine(),
+        "packages": versions,
+    }
+
+
+def compare(results: Dict, baseline: Dict, tolerance: float) -> bool:
+    ok = True
+    for name, current in results["cases"].items():
+        previous = baseline["cases"].get(name)
+        if previous is None:
+            print(f"{name:<26} new case")
+            continue
+        change = current["median_ns"] / previous["median_ns"] - 1
+        status = "ok"
+        if current["result"] != previous["result"]:
+            status = "RESULT CHANGED"
+            ok = False
+        elif change > tolerance:
+            status = "SLOWER"
+            ok = False
+        print(f"{name:<26} {previous['median_ns']:12.0f}ns -> {current['median_ns']:12.0f}ns  {change:+7.1%}  {status}")
+    return ok
+
+
+def main(args: argparse.Namespace) -> int:
+    cases = build_cases()
+    if args.only:
+        cases = [(name, fn) for name, fn in cases if name in args.only]
+    results = {"created_at": int(time.time()), "environment": environment(), "cases": {}}
+    for name, fn in cases:
+        fn()  # warm lru caches and lazy imports
+        results["cases"][name] = measure(fn, args.repeat, args.min_time)
+        print(f"{name:<26} {results['cases'][name]['median_ns']:12.0f}ns  {results['cases'][name]['ops_per_sec']:12.1f}/s",
+              file=sys.stderr)
+
+    output = json.dumps(results, indent=2)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as file:
+            file.write(output)
+    else:
+        print(output)
+
+    if args.baseline:
+        with open(args.baseline, 'r', encoding='utf-8') as file:
+            baseline = json.load(file)
+        return 0 if compare(results, baseline, args.tolerance) else 1
+    return 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=7, help="timing rounds per case, the median is reported")
+    parser.add_argument("--min-time", type=float, default=0.2, help="approximate seconds per round")
+    parser.add_argument("--only", nargs="+", help="run only these cases")
+    parser.add_argument("--output", help="write JSON results here instead of stdout")
+    parser.add_argument("--baseline", help="previous JSON results to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.1,
+                        help="allowed median slowdown against the baseline before exiting 1")
+    sys.exit(main(parser.parse_args()))
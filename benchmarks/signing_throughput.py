@@ -0,0 +1,69 @@
+"""
+Reports order signatures per second for single, batched and pooled signing.
+
+    python -m benchmarks.signing_throughput --count 2000 --workers 4
+"""
+import argparse
+import asyncio
+import time
+from decimal import Decimal
+
+from helpers.account import create_signing_executor, sign_template_batch_async, sign_template_messages
+from helpers.typed_data import get_template
+from order_manager import order_message
+from shared.paradex_api_utils import Order, OrderSide, OrderType
+from utils import int_from_bytes
+
+CHAIN_ID = int_from_bytes(b"PRIVATE_SN_POTC_SEPOLIA")
+ACCOUNT_ADDRESS = 0x129F3DC1B8962D8A87ABC692424C78FDA963ADE0E1C6BE7E8D2F1E8C1E5B7C1
+PRIVATE_KEY = 0x3C1E9550E66958296D11B60F8E8E7A7AD990D07FA65D5F7652C4A6C87D4E3CC
+
+
+def build_requests(count: int):
+    requests = []
+    for i in range(count):
+        order = Order(
+            market="BTC-USD-PERP" if i % 2 else "ETH-USD-PERP",
+            order_type=OrderType.Market,
+            order_side=OrderSide.Buy if i % 2 else OrderSide.Sell,
+            size=Decimal("0.01") + Decimal(i) / 1000,
+            signature_timestamp=1_700_000_000_000 + i,
+        )
+        requests.append((order_message(order), ACCOUNT_ADDRESS, PRIVATE_KEY))
+    return requests
+
+
+def report(name: str, count: int, elapsed: float) -> None:
+    print(f"{name:<10} {count:>7} sigs  {elapsed:8.3f}s  {count / elapsed:10.1f} sigs/s")
+
+
+async def main(count: int, workers: int) -> None:
+    requests = build_requests(count)
+    # Warm the template cache so every mode measures signing only
+    get_template("Order", CHAIN_ID)
+
+    start = time.perf_counter()
+    for request in requests:
+        sign_template_messages("Order", CHAIN_ID, [request])
+    report("single", count, time.perf_counter() - start)
+
+    start = time.perf_counter()
+    sign_template_messages("Order", CHAIN_ID, requests)
+    report("batched", count, time.perf_counter() - start)
+
+    for mode in ("thread", "process"):
+        executor = create_signing_executor(mode, workers)
+        # Spin the workers up before timing
+        await sign_template_batch_async("Order", CHAIN_ID, requests[:workers], executor, chunk_size=1)
+        start = time.perf_counter()
+        await sign_template_batch_async("Order", CHAIN_ID, requests, executor, chunk_size=-(-count // workers))
+        report(f"{mode}x{workers}", count, time.perf_counter() - start)
+        executor.shutdown()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--count", type=int, default=1000, help="signatures per mode")
+    parser.add_argument("--workers", type=int, default=4, help="pool size for the pooled modes")
+    args = parser.parse_args()
+    asyncio.run(main(args.count, args.workers))
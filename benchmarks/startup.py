@@ -0,0 +1,85 @@
+"""
+Reports cold-start costs: importing the bot, deriving accounts and signing the first order.
+Every run happens in a fresh interpreter so nothing is already imported or cached.
+
+    python -m benchmarks.startup --runs 5 --accounts 10
+"""
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+import time
+
+# Offline stand-in for GET /system/config, only the keys account derivation reads
+PARADEX_CONFIG = {
+    "l1_chain_id": "11155111",
+    "starknet_chain_id": "PRIVATE_SN_POTC_SEPOLIA",
+    "starknet_fullnode_rpc_url": "http://localhost:9545",
+    "paraclear_account_hash": "0x41cb0280ebadaa75f996d8d92c6f265f6d040bb3ba442e5f86a554f1765244d",
+    "paraclear_account_proxy_hash": "0x3530cc4759d78042f1b543bf797f5f3d647cde0388c33734cf91b7f7b9314a9",
+}
+
+
+def eth_private_keys(count: int):
+    return [f"0x{i + 1:064x}" for i in range(count)]
+
+
+def child(accounts: int) -> None:
+    timings = {}
+
+    start = time.perf_counter()
+    import app  # noqa: F401
+    from decimal import Decimal
+    from order_manager import sign_order_async
+    from paradex_account import ParadexAccount
+    from shared.paradex_api_utils import Order, OrderSide, OrderType
+    from utils import generate_paradex_account, int_from_bytes
+    timings["import"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    derived = [generate_paradex_account(PARADEX_CONFIG, key) for key in eth_private_keys(accounts)]
+    timings["derive_per_account"] = (time.perf_counter() - start) / accounts
+
+    import asyncio
+    start = time.perf_counter()
+    address, private_key = derived[0]
+    account = ParadexAccount(private_key, address, PARADEX_CONFIG)
+    order = Order(
+        market="BTC-USD-PERP",
+        order_type=OrderType.Market,
+        order_side=OrderSide.Buy,
+        size=Decimal("0.01"),
+        signature_timestamp=int(time.time() * 1000),
+    )
+    chain_id = int_from_bytes(PARADEX_CONFIG["starknet_chain_id"].encode())
+    order.signature = asyncio.run(sign_order_async(chain_id, account.account, order))
+    timings["first_order"] = time.perf_counter() - start
+
+    print(json.dumps(timings))
+
+
+def main(runs: int, accounts: int) -> None:
+    results = []
+    for _ in range(runs):
+        output = subprocess.run(
+            [sys.executable, "-m", "benchmarks.startup", "--child", "--accounts", str(accounts)],
+            check=True, capture_output=True, text=True,
+        ).stdout
+        results.append(json.loads(output.strip().splitlines()[-1]))
+
+    for name in ("import", "derive_per_account", "first_order"):
+        values = [result[name] for result in results]
+        print(f"{name:<20} median {statistics.median(values) * 1000:9.1f}ms  min {min(values) * 1000:9.1f}ms")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=5, help="fresh interpreters to start")
+    parser.add_argument("--accounts", type=int, default=10, help="accounts derived per run")
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.child:
+        child(args.accounts)
+    else:
+        main(args.runs, args.accounts)
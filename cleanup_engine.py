@@ -0,0 +1,241 @@
+import asyncio
+import logging
+from typing import Awaitable, Callable, Dict, List, Optional, Set, Tuple
+from paradex_account import ParadexAccount
+from pair_order import PairOrder
+from pair_registry import PairRegistry
+from paradex_api_client import ParadexAPIClient
+from order_manager import OrderManager, OrderSpec, order_accepted
+from account_state import AccountStateEngine
+from shared.paradex_api_utils import Order
+
+
+def position_notional(position: Dict) -> float:
+    return abs(float(position.get("size") or 0)) * float(position.get("average_entry_price") or 0)
+
+
+class CleanupReport:
+    __slots__ = ("finished", "unfinished", "timed_out")
+
+    def __init__(self):
+        self.finished: Set[str] = set()
+        # Account address -> why it could not be cleaned up
+        self.unfinished: Dict[str, str] = {}
+        self.timed_out = False
+
+    def fail(self, account: ParadexAccount, reason: str) -> None:
+        address = hex(account.account.address)
+        self.finished.discard(address)
+        self.unfinished.setdefault(address, reason)
+
+
+class CleanupEngine:
+    """
+    Cancels open orders and closes open pairs for every account on shutdown, at most
+    `concurrency` requests at a time and within `deadline` seconds. Accounts in the pairs
+    with the largest notional go first so a cut-off leaves the smallest exposure open, and a
+    pair is closed as soon as its own accounts have had their orders cancelled, so DELETE
+    /orders can't hit a close order. Close orders of one account go out together, batched
+    where the exchange supports it.
+    """
+
+    def __init__(
+            self,
+            api_client: ParadexAPIClient,
+            order_manager: OrderManager,
+            account_state: AccountStateEngine,
+            update_jwt: Callable[[ParadexAccount], Awaitable[None]],
+            concurrency: int = 20,
+            deadline: float = 8
+    ):
+        self.api_client = api_client
+        self.order_manager = order_manager
+        self.account_state = account_state
+        self.update_jwt = update_jwt
+        self.concurrency = concurrency
+        self.deadline = deadline
+
+    async def run(
+            self,
+            accounts: List[ParadexAccount],
+            pairs: PairRegistry,
+            deadline_at: Optional[float] = None
+    ) -> CleanupReport:
+        """`deadline_at` is an absolute loop.time(), e.g. when the shutdown signal arrived plus `deadline`."""
+        loop = asyncio.get_running_loop()
+        if deadline_at is None:
+            deadline_at = loop.time() + self.deadline
+        if deadline_at <= loop.time():
+            logging.error("Cleanup deadline passed before cleanup started")
+        semaphore = asyncio.Semaphore(self.concurrency)
+        report = CleanupReport()
+        report.finished.update(hex(account.account.address) for account in accounts)
+
+        async def limited(fn: Callable[..., Awaitable], *args):
+            async with semaphore:
+                return await fn(*args)
+
+        # Accounts holding pairs go first, largest pair first, and the semaphore is FIFO
+        groups = self._close_groups(pairs)
+        prepared: Dict[int, asyncio.Task] = {}
+        for group in groups:
+            for pair_order in group:
+                for account in pair_order.accounts:
+                    if account.account.address not in prepared:
+                        prepared[account.account.address] = asyncio.ensure_future(
+                            limited(self._cancel_and_get_positions, account, report)
+                        )
+        closing = {
+            asyncio.ensure_future(self._close_group(group, prepared, limited, pairs, report)): group
+            for group in groups
+        }
+        rest = [account for account in accounts if account.account.address not in prepared]
+        logging.info(f"Cleanup: closing {sum(map(len, groups))} pairs, then cancelling orders for {len(rest)} more accounts")
+
+        async def cancel_rest() -> None:
+            # These accounts only ever sent market orders, so their cancels wait until every close is out
+            if closing:
+                await asyncio.wait(list(closing))
+            for account in rest:
+                prepared[account.account.address] = asyncio.ensure_future(
+                    limited(self._cancel_and_get_positions, account, report)
+                )
+            if rest:
+                await asyncio.wait([prepared[account.account.address] for account in rest])
+
+        cancelling = asyncio.ensure_future(cancel_rest())
+        await asyncio.wait([cancelling], timeout=max(0, deadline_at - loop.time()))
+        pending = [task for task in [cancelling, *closing, *prepared.values()] if not task.done()]
+        for task in pending:
+            task.cancel()
+        if pending:
+            report.timed_out = True
+            await asyncio.gather(*pending, return_exceptions=True)
+        for task, group in closing.items():
+            if task.cancelled():
+                for pair_order in group:
+                    self._fail_pair(pair_order, report, "deadline reached")
+            elif task.exception() is not None:
+                for pair_order in group:
+                    self._fail_pair(pair_order, report, str(task.exception()))
+        for account in accounts:
+            task = prepared.get(account.account.address)
+            if task is None or task.cancelled():
+                report.fail(account, "deadline reached while cancelling orders and reading positions")
+            elif task.exception() is not None:
+                report.fail(account, f"failed to read positions: {str(task.exception())}")
+
+        if report.unfinished:
+            logging.error(f"Cleanup finished {len(report.finished)}/{len(accounts)} accounts, unfinished:")
+            for address, reason in report.unfinished.items():
+                logging.error(f"  {address}: {reason}")
+        else:
+            logging.info(f"Cleanup finished all {len(accounts)} accounts")
+        return report
+
+    async def _cancel_and_get_positions(self, account: ParadexAccount, report: CleanupReport) -> List[Dict]:
+        await self.update_jwt(account)
+        try:
+            await self.api_client.cancel_orders(account.jwt)
+            logging.info(f"Cancelled all open orders for account {hex(account.account.address)}")
+        except Exception as e:
+            # Still close its pairs: no cancel will follow that could hit the close orders
+            report.fail(account, f"failed to cancel orders: {str(e)}")
+        return await self.account_state.get_positions(account)
+
+    def _estimated_notional(self, pair_order: PairOrder) -> float:
+        # From the account streams, so ordering costs no requests; unknown positions sort last
+        notional = 0.0
+        for account in pair_order.accounts:
+            snapshot = self.account_state.get_snapshot(account)
+            position = snapshot.positions.get(pair_order.symbol) if snapshot else None
+            if position and position.get("status") == "OPEN":
+                notional = max(notional, position_notional(position))
+        return notional
+
+    def _close_groups(self, pairs: PairRegistry) -> List[List[PairOrder]]:
+        """
+        Pairs that share an account, so their close orders can be batched per account. Each group
+        is closed as soon as all of its accounts are ready; groups are ordered by their largest pair.
+        """
+        notionals = {pair_order: self._estimated_notional(pair_order) for pair_order in pairs}
+        groups: List[List[PairOrder]] = []
+        for pair_order in notionals:
+            addresses = set(pair_order.addresses())
+            touching = [group for group in groups if any(addresses.intersection(member.addresses()) for member in group)]
+            groups = [group for group in groups if not any(group is other for other in touching)]
+            groups.append([pair_order] + [member for group in touching for member in group])
+        for group in groups:
+            group.sort(key=notionals.get, reverse=True)
+        return sorted(groups, key=lambda group: notionals[group[0]], reverse=True)
+
+    async def _close_group(
+            self,
+            group: List[PairOrder],
+            prepared: Dict[int, asyncio.Task],
+            limited: Callable[..., Awaitable],
+            pairs: PairRegistry,
+            report: CleanupReport
+    ) -> None:
+        addresses = {address for pair_order in group for address in pair_order.addresses()}
+        waiting = [prepared[address] for address in addresses if address in prepared]
+        if waiting:
+            # asyncio.wait leaves the shared tasks running if this group is cancelled
+            await asyncio.wait(waiting)
+        positions = {
+            address: prepared[address].result()
+            for address in addresses
+            if address in prepared and not prepared[address].cancelled() and prepared[address].exception() is None
+        }
+        to_close = []
+        for pair_order in group:
+            if all(address in positions for address in pair_order.addresses()):
+                to_close.append(pair_order)
+            else:
+                # Closing only the legs we could read would leave the pair unhedged
+                self._fail_pair(pair_order, report, "positions of a leg are unavailable")
+        closes = await self.order_manager.build_close_orders(to_close, positions)
+
+        by_account: Dict[int, List[int]] = {}
+        for i, (_, spec, _) in enumerate(closes):
+            by_account.setdefault(spec.account.account.address, []).append(i)
+        results: List = [None] * len(closes)
+
+        async def submit_account(indexes: List[int]) -> None:
+            account = closes[indexes[0]][1].account
+            account_results = await self.order_manager.submit_account_orders(account, [closes[i][2] for i in indexes])
+            for i, result in zip(indexes, account_results):
+                results[i] = result
+
+        await asyncio.gather(*[limited(submit_account, indexes) for indexes in by_account.values()])
+        self._record_closes(to_close, closes, results, pairs, report)
+
+    def _record_closes(
+            self,
+            to_close: List[PairOrder],
+            closes: List[Tuple[PairOrder, OrderSpec, Order]],
+            results: List,
+            pairs: PairRegistry,
+            report: CleanupReport
+    ) -> None:
+        failed: Dict[PairOrder, str] = {}
+        for (pair_order, spec, _), result in zip(closes, results):
+            if result is None:
+                failed.setdefault(pair_order, "deadline reached")
+            elif not order_accepted(result):
+                failed.setdefault(pair_order, f"close order for {hex(spec.account.account.address)} failed: {result!r}")
+        for pair_order in to_close:
+            if pair_order in failed:
+                self._fail_pair(pair_order, report, failed[pair_order])
+                continue
+            # Pairs whose legs were already flat need no orders and are done as well
+            pairs.remove(pair_order)
+            accounts_str = [hex(account.account.address) for account in pair_order.accounts]
+            logging.info(f"Closing position {pair_order.symbol} for account {accounts_str} successfully")
+
+    @staticmethod
+    def _fail_pair(pair_order: PairOrder, report: CleanupReport, reason: str) -> None:
+        accounts_str = [hex(account.account.address) for account in pair_order.accounts]
+        logging.error(f"Failed to close position {pair_order.symbol} for account {accounts_str}: {reason}")
+        for account in pair_order.accounts:
+            report.fail(account, f"failed to close {pair_order.symbol}: {reason}")
@@ -0,0 +1,151 @@
+"""
+Derives ETH keys, Stark keys and Paradex account addresses for a range of HD wallet
+indexes in a process pool and streams them to a file as each chunk completes.
+
+The mnemonic is read from $PARADEX_MNEMONIC or --mnemonic-file, never from the command line.
+
+    PARADEX_MNEMONIC="..." python derive_accounts.py --start 0 --count 5000 --output accounts.jsonl
+    python derive_accounts.py --mnemonic-file phrase.txt --count 5000 --output .secrets --format secrets --key-cache .key_cache
+"""
+import argparse
+import asyncio
+import json
+import logging
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional
+
+from key_cache import KeyCache
+from paradex_api_client import ParadexAPIClient
+from utils import generate_paradex_account
+
+HD_PATH_TEMPLATE = "m/44'/60'/0'/0/{}"
+
+# Set once per worker process by _init_worker so the BIP39 seed (2048 PBKDF2 rounds)
+# is computed once per process instead of once per index
+_seed: Optional[bytes] = None
+_paradex_config: Optional[Dict] = None
+
+
+def _init_worker(mnemonic: str, passphrase: str, paradex_config: Dict) -> None:
+    global _seed, _paradex_config
+    from eth_account.hdaccount import seed_from_mnemonic
+
+    _seed = seed_from_mnemonic(mnemonic, passphrase)
+    _paradex_config = paradex_config
+
+
+def derive_chunk(start: int, stop: int) -> List[Dict]:
+    from eth_account.hdaccount import key_from_seed
+    from eth_keys import keys
+
+    accounts = []
+    for index in range(start, stop):
+        eth_key = keys.PrivateKey(key_from_seed(_seed, HD_PATH_TEMPLATE.format(index)))
+        eth_private_key = eth_key.to_hex()
+        paradex_address, paradex_private_key = generate_paradex_account(_paradex_config, eth_private_key)
+        accounts.append({
+            "index": index,
+            "eth_address": eth_key.public_key.to_checksum_address(),
+            "eth_private_key": eth_private_key,
+            "paradex_address": paradex_address,
+            "paradex_private_key": paradex_private_key,
+        })
+    return accounts
+
+
+def format_account(account: Dict, output_format: str) -> str:
+    if output_format == "secrets":
+        # One ETH private key per line, the format app.py reads from .secrets
+        return account["eth_private_key"]
+    return json.dumps(account)
+
+
+def read_mnemonic(mnemonic_file: Optional[str]) -> str:
+    if mnemonic_file:
+        with open(mnemonic_file, 'r', encoding='utf-8') as file:
+            return " ".join(file.read().split())
+    mnemonic = os.getenv("PARADEX_MNEMONIC", "").strip()
+    if not mnemonic:
+        raise Exception("Set PARADEX_MNEMONIC or pass --mnemonic-file")
+    return mnemonic
+
+
+async def fetch_paradex_config(paradex_http_url: str) -> Dict:
+    async with ParadexAPIClient(paradex_http_url) as api_client:
+        return await api_client.get_config()
+
+
+def load_paradex_config(args: argparse.Namespace) -> Dict:
+    if args.system_config:
+        with open(args.system_config, 'r', encoding='utf-8') as file:
+            return json.load(file)
+    with open(args.config, 'r', encoding='utf-8') as file:
+        paradex_http_url = json.load(file)['paradex_http_url']
+    return asyncio.run(fetch_paradex_config(paradex_http_url))
+
+
+def derive_accounts(args: argparse.Namespace) -> None:
+    mnemonic = read_mnemonic(args.mnemonic_file)
+    paradex_config = load_paradex_config(args)
+    key_cache = KeyCache(args.key_cache, paradex_config) if args.key_cache else None
+    if key_cache:
+        key_cache.load()
+
+    stop = args.start + args.count
+    chunks = [(start, min(start + args.chunk_size, stop)) for start in range(args.start, stop, args.chunk_size)]
+    flags = os.O_WRONLY | os.O_CREAT | (os.O_APPEND if args.append else os.O_EXCL)
+    fd = os.open(args.output, flags, 0o600)
+
+    started_at = time.monotonic()
+    done = 0
+    with os.fdopen(fd, 'w', encoding='utf-8') as output, ProcessPoolExecutor(
+        max_workers=args.workers,
+        initializer=_init_worker,
+        initargs=(mnemonic, args.passphrase, paradex_config),
+    ) as executor:
+        # map yields chunks in index order as they finish, so the file is always a prefix of the range
+        for accounts in executor.map(derive_chunk, *zip(*chunks)):
+            output.write("".join(f"{format_account(account, args.format)}\n" for account in accounts))
+            output.flush()
+            if key_cache:
+                for account in accounts:
+                    key_cache.put(account["eth_private_key"], account["paradex_address"], account["paradex_private_key"])
+            done += len(accounts)
+            elapsed = time.monotonic() - started_at
+            logging.info(f"Derived {done}/{args.count} accounts (last index {accounts[-1]['index']}, {done / elapsed:.1f}/s)")
+
+    if key_cache:
+        key_cache.save()
+    logging.info(f"Wrote {done} accounts to {args.output} in {time.monotonic() - started_at:.1f}s")
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--start", type=int, default=0, help="first HD wallet index")
+    parser.add_argument("--count", type=int, required=True, help="number of indexes to derive")
+    parser.add_argument("--output", required=True, help="file to stream results to, created with mode 0600")
+    parser.add_argument("--append", action="store_true", help="append to an existing output file")
+    parser.add_argument("--format", choices=("jsonl", "secrets"), default="jsonl",
+                        help="jsonl: every key and address per line, secrets: ETH private keys only")
+    parser.add_argument("--mnemonic-file", help="read the mnemonic from this file instead of $PARADEX_MNEMONIC")
+    parser.add_argument("--passphrase", default="", help="optional BIP39 passphrase")
+    parser.add_argument("--workers", type=int, default=None, help="process pool size, defaults to the CPU count")
+    parser.add_argument("--chunk-size", type=int, default=50, help="indexes per worker task")
+    parser.add_argument("--config", default="config.json", help="bot config used for paradex_http_url")
+    parser.add_argument("--system-config", help="saved GET /system/config response, to derive offline")
+    parser.add_argument("--key-cache", help="also store the derived accounts in this key cache")
+    args = parser.parse_args()
+    if args.count <= 0 or args.start < 0 or args.chunk_size <= 0:
+        parser.error("--count and --chunk-size must be positive and --start non-negative")
+    return args
+
+
+if __name__ == "__main__":
+    logging.basicConfig(
+        level=os.getenv("LOGGING_LEVEL", "INFO"),
+        format="%(asctime)s.%(msecs)03d | %(levelname)s | %(message)s",
+        datefmt="%Y-%m-%d %H:%M:%S",
+    )
+    derive_accounts(parse_args())
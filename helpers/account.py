@@ -1,33 +1,183 @@
-from typing import List, Optional
+import asyncio
+import os
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import TYPE_CHECKING, Dict, List, NamedTuple, Optional, Sequence, Tuple, Union
 
-from starknet_py.net.account.account import Account as StarknetAccount
-from starknet_py.net.client import Client
-from starknet_py.net.models import AddressRepresentation, StarknetChainId
-from starknet_py.net.signer import BaseSigner
-from starknet_py.net.signer.stark_curve_signer import KeyPair
-from starknet_py.utils.typed_data import TypedData as TypedDataDataclass
+from .utils import message_signature, private_to_stark_key
 
+if TYPE_CHECKING:
+    from starknet_py.net.client import Client
 
-from .typed_data import TypedData
-from .utils import message_signature
+    from .starknet_account import Account
 
 
-class Account(StarknetAccount):
+def __getattr__(name: str):
+    if name == "Account":
+        from .starknet_account import Account
+
+        return Account
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def sign_typed_data(typed_data: Dict, account_address: int, private_key: int) -> List[int]:
+    """
+    Signs typed data for an account. Module level so it can run in a process pool.
+    """
+    from starknet_py.utils.typed_data import TypedData as TypedDataDataclass
+
+    typed_data_dataclass = TypedDataDataclass.from_dict(typed_data)
+    msg_hash = typed_data_dataclass.message_hash(account_address)
+    r, s = message_signature(msg_hash=msg_hash, priv_key=private_key)
+    return [r, s]
+
+
+def sign_template_message(
+    primary_type: str, chain_id: int, message: Dict, account_address: int, private_key: int
+) -> List[int]:
+    """
+    Signs only the variable fields of a message using the precompiled template for its type and chain.
+    """
+    from .typed_data import get_template
+
+    msg_hash = get_template(primary_type, chain_id).message_hash(account_address, message)
+    r, s = message_signature(msg_hash=msg_hash, priv_key=private_key)
+    return [r, s]
+
+
+def sign_template_messages(
+    primary_type: str, chain_id: int, requests: Sequence[Tuple[Dict, int, int]]
+) -> List[List[int]]:
+    """
+    Signs a batch of (message, account_address, private_key) requests sharing one template.
+    """
+    return [
+        sign_template_message(primary_type, chain_id, message, account_address, private_key)
+        for message, account_address, private_key in requests
+    ]
+
+
+async def sign_template_batch_async(
+    primary_type: str,
+    chain_id: int,
+    requests: Sequence[Tuple[Dict, int, int]],
+    executor: Optional[Executor] = None,
+    chunk_size: Optional[int] = None,
+) -> List[List[int]]:
+    """
+    Spreads a batch of signing requests over `executor` in chunks, one chunk per core by default.
+    Signatures are returned in request order.
+    """
+    if not requests:
+        return []
+    chunk_size = chunk_size or -(-len(requests) // (os.cpu_count() or 1))
+    loop = asyncio.get_running_loop()
+    chunks = await asyncio.gather(
+        *[
+            loop.run_in_executor(
+                executor, sign_template_messages, primary_type, chain_id, requests[i:i + chunk_size]
+            )
+            for i in range(0, len(requests), chunk_size)
+        ]
+    )
+    return [sig for chunk in chunks for sig in chunk]
+
+
+def create_signing_executor(mode: str = "thread", max_workers: Optional[int] = None) -> Executor:
+    """
+    Creates the executor used by `Account.sign_message_async`, either "thread" or "process".
+    """
+    if mode == "process":
+        return ProcessPoolExecutor(max_workers=max_workers)
+    if mode == "thread":
+        return ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="signer")
+    raise ValueError(f"Unknown signing executor mode: {mode}")
+
+
+class SigningMixin:
+    """
+    Paradex signing methods shared by the full and the signer-only account types.
+    Requires `address` and `private_key` on the concrete class.
+    """
+    __slots__ = ()
+
+    def sign_message(self, typed_data: Dict) -> List[int]:
+        return sign_typed_data(typed_data, self.address, self.private_key)
+
+    async def sign_message_async(self, typed_data: Dict, executor: Optional[Executor] = None) -> List[int]:
+        """
+        Signs typed data in `executor` (the loop's default executor if None) to keep the event loop free.
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(executor, sign_typed_data, typed_data, self.address, self.private_key)
+
+    def sign_template(self, primary_type: str, chain_id: int, message: Dict) -> List[int]:
+        return sign_template_message(primary_type, chain_id, message, self.address, self.private_key)
+
+    async def sign_template_async(
+        self, primary_type: str, chain_id: int, message: Dict, executor: Optional[Executor] = None
+    ) -> List[int]:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            executor, sign_template_message, primary_type, chain_id, message, self.address, self.private_key
+        )
+
+
+class StarkKeyPair(NamedTuple):
+    """
+    Stark key pair computed with starknet_crypto_py, without importing starknet_py's signer.
+    """
+    private_key: int
+    public_key: int
+
+    @staticmethod
+    def from_private_key(key: Union[int, str]) -> "StarkKeyPair":
+        private_key = int(key, 16) if isinstance(key, str) else key
+        return StarkKeyPair(private_key=private_key, public_key=private_to_stark_key(private_key))
+
+
+class SignerAccount(SigningMixin):
+    """
+    Compact account that can only sign. The starknet_py `Account` and its RPC client
+    are built lazily, the first time an on-chain call needs them.
+    """
+    __slots__ = ("address", "key_pair", "chain_id", "node_url", "_starknet_account")
+
     def __init__(
         self,
         *,
-        address: AddressRepresentation,
-        client: Client,
-        signer: Optional[BaseSigner] = None,
-        key_pair: Optional[KeyPair] = None,
-        chain: Optional[StarknetChainId] = None,
+        address: Union[int, str],
+        key_pair: StarkKeyPair,
+        chain_id: int,
+        node_url: Optional[str] = None,
     ):
-        super().__init__(
-            address=address, client=client, signer=signer, key_pair=key_pair, chain=chain
-        )
+        self.address = int(address, 16) if isinstance(address, str) else address
+        self.key_pair = key_pair
+        self.chain_id = chain_id
+        self.node_url = node_url
+        self._starknet_account: Optional["Account"] = None
+
+    @property
+    def private_key(self) -> int:
+        return self.key_pair.private_key
+
+    @property
+    def starknet_account(self) -> "Account":
+        if self._starknet_account is None:
+            if not self.node_url:
+                raise ValueError("SignerAccount has no node_url for on-chain calls")
+            from starknet_py.net.full_node_client import FullNodeClient
+            from starknet_py.net.signer.stark_curve_signer import KeyPair
+
+            from .starknet_account import Account
+
+            self._starknet_account = Account(
+                address=self.address,
+                client=FullNodeClient(node_url=self.node_url),
+                key_pair=KeyPair(private_key=self.key_pair.private_key, public_key=self.key_pair.public_key),
+                chain=self.chain_id,
+            )
+        return self._starknet_account
 
-    def sign_message(self, typed_data: TypedData) -> List[int]:
-        typed_data_dataclass = TypedDataDataclass.from_dict(typed_data)
-        msg_hash = typed_data_dataclass.message_hash(self.address)
-        r, s = message_signature(msg_hash=msg_hash, priv_key=self.signer.key_pair.private_key)
-        return [r, s]
+    @property
+    def client(self) -> "Client":
+        return self.starknet_account.client
@@ -0,0 +1,28 @@
+from typing import Optional
+
+from starknet_py.net.account.account import Account as StarknetAccount
+from starknet_py.net.client import Client
+from starknet_py.net.models import AddressRepresentation, StarknetChainId
+from starknet_py.net.signer import BaseSigner
+from starknet_py.net.signer.stark_curve_signer import KeyPair
+
+from .account import SigningMixin
+
+
+class Account(SigningMixin, StarknetAccount):
+    def __init__(
+        self,
+        *,
+        address: AddressRepresentation,
+        client: Client,
+        signer: Optional[BaseSigner] = None,
+        key_pair: Optional[KeyPair] = None,
+        chain: Optional[StarknetChainId] = None,
+    ):
+        super().__init__(
+            address=address, client=client, signer=signer, key_pair=key_pair, chain=chain
+        )
+
+    @property
+    def private_key(self) -> int:
+        return self.signer.key_pair.private_key
@@ -1,4 +1,5 @@
-from typing import List, Union, cast
+import functools
+from typing import Dict, List, Union, cast
 
 from starknet_py.cairo.felt import encode_shortstring
 from starknet_py.utils.typed_data import (
@@ -8,7 +9,33 @@ from starknet_py.utils.typed_data import (
     strip_pointer,
 )
 
-from .utils import compute_hash_on_elements
+from .utils import compute_hash_on_elements, pedersen_hash
+
+STARKNET_MESSAGE_PREFIX = encode_shortstring("StarkNet Message")
+
+STARKNET_DOMAIN_TYPE = [
+    {"name": "name", "type": "felt"},
+    {"name": "chainId", "type": "felt"},
+    {"name": "version", "type": "felt"},
+]
+
+PRIMARY_TYPES = {
+    "Order": [
+        {"name": "timestamp", "type": "felt"},
+        {"name": "market", "type": "felt"},
+        {"name": "side", "type": "felt"},
+        {"name": "orderType", "type": "felt"},
+        {"name": "size", "type": "felt"},
+        {"name": "price", "type": "felt"},
+    ],
+    "Request": [
+        {"name": "method", "type": "felt"},
+        {"name": "path", "type": "felt"},
+        {"name": "body", "type": "felt"},
+        {"name": "timestamp", "type": "felt"},
+        {"name": "expiration", "type": "felt"},
+    ],
+}
 
 
 class TypedData(StarknetTypedDataDataclass):
@@ -57,3 +84,59 @@ class TypedData(StarknetTypedDataDataclass):
         ]
 
         return compute_hash_on_elements(message)
+
+
+@functools.lru_cache(maxsize=4096)
+def _encode_str_felt(value: str) -> int:
+    return int(get_hex(value), 16)
+
+
+def encode_felt(value: Union[int, str]) -> int:
+    """
+    Encodes a felt the same way as `get_hex`, caching short strings such as markets and order types.
+    """
+    if isinstance(value, int):
+        return value
+    return _encode_str_felt(value)
+
+
+class TypedDataTemplate:
+    """
+    Precompiled Paradex typed data for one primary type on one chain.
+
+    The domain hash, type hash and the constant prefix of both Pedersen hash chains
+    are computed once, so hashing a message only hashes its variable fields.
+    """
+
+    def __init__(self, primary_type: str, chain_id: int):
+        self.primary_type = primary_type
+        self.chain_id = chain_id
+        self.fields = [param["name"] for param in PRIMARY_TYPES[primary_type]]
+        typed_data = TypedData.from_dict(
+            {
+                "domain": {"name": "Paradex", "chainId": hex(chain_id), "version": "1"},
+                "primaryType": primary_type,
+                "types": {"StarkNetDomain": STARKNET_DOMAIN_TYPE, primary_type: PRIMARY_TYPES[primary_type]},
+                "message": {},
+            }
+        )
+        self.domain_hash = typed_data.struct_hash("StarkNetDomain", cast(dict, typed_data.domain))
+        self.type_hash = typed_data.type_hash(primary_type)
+        self._message_prefix = pedersen_hash(pedersen_hash(0, STARKNET_MESSAGE_PREFIX), self.domain_hash)
+        self._struct_prefix = pedersen_hash(0, self.type_hash)
+
+    def struct_hash(self, message: Dict) -> int:
+        h = self._struct_prefix
+        for field in self.fields:
+            h = pedersen_hash(h, encode_felt(message[field]))
+        return pedersen_hash(h, len(self.fields) + 1)
+
+    def message_hash(self, account_address: int, message: Dict) -> int:
+        h = pedersen_hash(self._message_prefix, account_address)
+        h = pedersen_hash(h, self.struct_hash(message))
+        return pedersen_hash(h, 4)
+
+
+@functools.lru_cache(maxsize=None)
+def get_template(primary_type: str, chain_id: int) -> TypedDataTemplate:
+    return TypedDataTemplate(primary_type, chain_id)
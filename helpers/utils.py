@@ -1,7 +1,8 @@
 import functools
+import hashlib
+import hmac
 from typing import List, Optional, Sequence
 from starknet_py.constants import EC_ORDER
-from starkware.crypto.signature.signature import generate_k_rfc6979
 
 from starknet_crypto_py import (
     get_public_key as rs_get_public_key,
@@ -44,6 +45,55 @@ def compute_hash_on_elements(data: Sequence) -> int:
     return functools.reduce(pedersen_hash, [*data, len(data)], 0)
 
 
+# ###
+# RFC6979 deterministic nonce, compatible with starkware.crypto's generate_k_rfc6979
+# without importing cairo-lang. Specialised for SHA-256 and the 252-bit EC_ORDER.
+# ###
+
+_EC_ORDER_BITS = EC_ORDER.bit_length()
+_EC_ORDER_BYTES = (EC_ORDER.bit_length() + 7) // 8
+
+
+def _bits2int(data: bytes) -> int:
+    x = int.from_bytes(data, "big")
+    excess = len(data) * 8 - _EC_ORDER_BITS
+    return x >> excess if excess > 0 else x
+
+
+def _hmac_sha256(key: bytes, data: bytes) -> bytes:
+    return hmac.digest(key, data, hashlib.sha256)
+
+
+def generate_k_rfc6979(msg_hash: int, priv_key: int, seed: Optional[int] = None) -> int:
+    """
+    Generates the deterministic signature nonce k for msg_hash (RFC6979 section 3.2).
+    """
+    # Pad the message hash, for consistency with the elliptic.js library.
+    if 1 <= msg_hash.bit_length() % 8 <= 4 and msg_hash.bit_length() >= 248:
+        # Only if we are one-nibble short:
+        msg_hash *= 16
+    extra_entropy = b"" if seed is None else seed.to_bytes((seed.bit_length() + 7) // 8, "big")
+
+    h1 = _bits2int(msg_hash.to_bytes((msg_hash.bit_length() + 7) // 8, "big"))
+    if h1 >= EC_ORDER:
+        h1 -= EC_ORDER
+    bx = priv_key.to_bytes(_EC_ORDER_BYTES, "big") + h1.to_bytes(_EC_ORDER_BYTES, "big") + extra_entropy
+
+    v = b"\x01" * 32
+    k = _hmac_sha256(b"\x00" * 32, v + b"\x00" + bx)
+    v = _hmac_sha256(k, v)
+    k = _hmac_sha256(k, v + b"\x01" + bx)
+    v = _hmac_sha256(k, v)
+    while True:
+        # SHA-256 output is exactly _EC_ORDER_BYTES long, so a single block is enough
+        v = _hmac_sha256(k, v)
+        secret = _bits2int(v)
+        if 1 <= secret < EC_ORDER:
+            return secret
+        k = _hmac_sha256(k, v + b"\x00")
+        v = _hmac_sha256(k, v)
+
+
 def message_signature(
     msg_hash: int, priv_key: int, seed: Optional[int] = None
 ) -> tuple[int, int]:
@@ -0,0 +1,134 @@
+import asyncio
+import base64
+import json
+import logging
+import random
+import time
+from typing import Awaitable, Callable, Dict, Optional
+from paradex_account import ParadexAccount
+
+
+def decode_jwt_expiry(token: str) -> Optional[int]:
+    try:
+        payload = token.split(".")[1]
+        payload += "=" * (-len(payload) % 4)
+        return int(json.loads(base64.urlsafe_b64decode(payload))["exp"])
+    except (IndexError, KeyError, TypeError, ValueError):
+        return None
+
+
+class CachedToken:
+    __slots__ = ("token", "expires_at", "refresh_at")
+
+    def __init__(self, token: str, expires_at: float, refresh_at: float):
+        self.token = token
+        self.expires_at = expires_at
+        # When the background loop renews it, jittered per account so renewals don't line up
+        self.refresh_at = refresh_at
+
+    def expires_within(self, seconds: float) -> bool:
+        return self.expires_at - time.time() <= seconds
+
+
+class JWTManager:
+    def __init__(
+            self,
+            fetch_token: Callable[[ParadexAccount], Awaitable[str]],
+            refresh_margin: float = 60,
+            refresh_interval: float = 10,
+            default_ttl: float = 24 * 60 * 60,
+            concurrency: int = 20,
+            refresh_jitter: Optional[float] = None
+    ):
+        self.fetch_token = fetch_token
+        self.refresh_margin = refresh_margin
+        self.refresh_interval = refresh_interval
+        self.default_ttl = default_ttl
+        self.refresh_jitter = refresh_margin if refresh_jitter is None else refresh_jitter
+        # Bounds concurrent /auth calls, which all tokens issued at bootstrap would otherwise make at once
+        self._semaphore = asyncio.Semaphore(concurrency)
+        self._accounts: Dict[int, ParadexAccount] = {}
+        self._tokens: Dict[int, CachedToken] = {}
+        self._inflight: Dict[int, asyncio.Task] = {}
+        self._issued_to: Dict[str, int] = {}
+        self._previous: Dict[int, str] = {}
+        self._refresh_task: Optional[asyncio.Task] = None
+
+    async def get_token(self, account: ParadexAccount) -> str:
+        cached = self._tokens.get(account.account.address)
+        if cached and not cached.expires_within(self.refresh_margin):
+            return cached.token
+        return await self.refresh(account)
+
+    async def refresh(self, account: ParadexAccount) -> str:
+        # Concurrent callers for the same account share one in-flight refresh
+        address = account.account.address
+        self._accounts[address] = account
+        task = self._inflight.get(address)
+        if task is None:
+            task = asyncio.ensure_future(self._refresh(account))
+            self._inflight[address] = task
+            task.add_done_callback(lambda t: self._inflight.pop(address, None) if self._inflight.get(address) is t else None)
+        return await asyncio.shield(task)
+
+    async def reauthenticate(self, token: str) -> Optional[str]:
+        """
+        Returns a fresh token for the account that was issued `token`, after the server refused it.
+        Concurrent 401s for one account share a single refresh; if the cached token has already
+        been replaced since `token` was issued, that newer token is returned without a refresh.
+        """
+        address = self._issued_to.get(token)
+        if address is None:
+            return None
+        cached = self._tokens.get(address)
+        if cached is not None and cached.token != token:
+            return cached.token
+        return await self.refresh(self._accounts[address])
+
+    async def _refresh(self, account: ParadexAccount) -> str:
+        async with self._semaphore:
+            token = await self.fetch_token(account)
+        now = time.time()
+        expires_at = decode_jwt_expiry(token) or now + self.default_ttl
+        jitter = min(self.refresh_jitter, max(0.0, expires_at - self.refresh_margin - now) / 2)
+        refresh_at = expires_at - self.refresh_margin - random.uniform(0, jitter)
+        address = account.account.address
+        previous = self._tokens.get(address)
+        if previous is not None:
+            # The current and the previous token stay mapped, so late 401s for either resolve to this account
+            self._issued_to.pop(self._previous.get(address), None)
+            self._previous[address] = previous.token
+        self._issued_to[token] = address
+        self._tokens[address] = CachedToken(token, expires_at, refresh_at)
+        account.update_jwt(token)
+        logging.debug(f"Refreshed JWT for account {hex(account.account.address)}, expires in {expires_at - time.time():.0f}s")
+        return token
+
+    def start(self) -> None:
+        if self._refresh_task is None or self._refresh_task.done():
+            self._refresh_task = asyncio.create_task(self._refresh_loop())
+
+    async def stop(self) -> None:
+        if self._refresh_task is None:
+            return
+        self._refresh_task.cancel()
+        try:
+            await self._refresh_task
+        except asyncio.CancelledError:
+            pass
+        self._refresh_task = None
+
+    async def _refresh_loop(self) -> None:
+        while True:
+            await asyncio.sleep(self.refresh_interval)
+            now = time.time()
+            expiring = [
+                self._accounts[address] for address, cached in self._tokens.items()
+                if now >= cached.refresh_at
+            ]
+            if not expiring:
+                continue
+            results = await asyncio.gather(*[self.refresh(account) for account in expiring], return_exceptions=True)
+            for account, result in zip(expiring, results):
+                if isinstance(result, Exception):
+                    logging.error(f"Failed to refresh JWT for account {hex(account.account.address)}: {str(result)}")
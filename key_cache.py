@@ -0,0 +1,105 @@
+import hashlib
+import json
+import logging
+import os
+from typing import Dict, Optional, Tuple
+from Crypto.Cipher import AES
+
+
+def _eth_identity(eth_private_key: str) -> Tuple[str, bytes]:
+    # eth_keys is much cheaper to import than eth_account, which a warm cache never needs
+    from eth_keys import keys
+
+    key = keys.PrivateKey(bytes.fromhex(eth_private_key[2:] if eth_private_key.startswith("0x") else eth_private_key))
+    return key.public_key.to_checksum_address(), key.to_bytes()
+
+
+def config_fingerprint(paradex_config: Dict) -> str:
+    # Derived keys and addresses only depend on these values
+    parts = [
+        str(paradex_config["l1_chain_id"]),
+        paradex_config["paraclear_account_hash"],
+        paradex_config["paraclear_account_proxy_hash"],
+    ]
+    return hashlib.sha256(":".join(parts).encode()).hexdigest()
+
+
+class KeyCache:
+    """
+    Encrypted on-disk cache of Paradex accounts derived from ETH private keys.
+
+    Each entry is encrypted with AES-GCM under a key derived from the ETH private key it
+    belongs to, so the file is useless without the matching `.secrets` entry. The whole
+    cache is dropped when the system config fingerprint changes.
+    """
+    VERSION = 1
+
+    def __init__(self, path: str, paradex_config: Dict):
+        self.path = path
+        self.fingerprint = config_fingerprint(paradex_config)
+        self._entries: Dict[str, Dict] = {}
+        self._dirty = False
+
+    def load(self) -> None:
+        if not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, 'r', encoding='utf-8') as file:
+                data = json.load(file)
+        except (OSError, ValueError) as e:
+            logging.warning(f"Ignoring unreadable key cache {self.path}: {str(e)}")
+            return
+        if data.get("version") != self.VERSION or data.get("fingerprint") != self.fingerprint:
+            logging.info(f"System config changed, invalidating key cache {self.path}")
+            self._dirty = True
+            return
+        self._entries = data.get("entries", {})
+
+    def save(self) -> None:
+        if not self._dirty:
+            return
+        data = {"version": self.VERSION, "fingerprint": self.fingerprint, "entries": self._entries}
+        tmp_path = f"{self.path}.tmp"
+        try:
+            fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+            with os.fdopen(fd, 'w', encoding='utf-8') as file:
+                json.dump(data, file)
+            os.replace(tmp_path, self.path)
+            self._dirty = False
+        except OSError as e:
+            logging.warning(f"Unable to write key cache {self.path}: {str(e)}")
+
+    def get(self, eth_private_key: str) -> Optional[Tuple[str, str]]:
+        eth_address, eth_key = _eth_identity(eth_private_key)
+        entry_id = self._entry_id(eth_address)
+        entry = self._entries.get(entry_id)
+        if entry is None:
+            return None
+        try:
+            cipher = AES.new(self._cipher_key(eth_key), AES.MODE_GCM, nonce=bytes.fromhex(entry["nonce"]))
+            cipher.update(entry_id.encode())
+            plaintext = cipher.decrypt_and_verify(bytes.fromhex(entry["ciphertext"]), bytes.fromhex(entry["tag"]))
+            account = json.loads(plaintext)
+            return account["address"], account["private_key"]
+        except (KeyError, ValueError) as e:
+            logging.warning(f"Dropping corrupt key cache entry for {eth_address}: {str(e)}")
+            del self._entries[entry_id]
+            self._dirty = True
+            return None
+
+    def put(self, eth_private_key: str, paradex_account_address: str, paradex_account_private_key_hex: str) -> None:
+        eth_address, eth_key = _eth_identity(eth_private_key)
+        entry_id = self._entry_id(eth_address)
+        plaintext = json.dumps({"address": paradex_account_address, "private_key": paradex_account_private_key_hex})
+        cipher = AES.new(self._cipher_key(eth_key), AES.MODE_GCM)
+        cipher.update(entry_id.encode())
+        ciphertext, tag = cipher.encrypt_and_digest(plaintext.encode())
+        self._entries[entry_id] = {"nonce": cipher.nonce.hex(), "ciphertext": ciphertext.hex(), "tag": tag.hex()}
+        self._dirty = True
+
+    def _entry_id(self, eth_address: str) -> str:
+        return hashlib.sha256(f"{eth_address.lower()}:{self.fingerprint}".encode()).hexdigest()
+
+    @staticmethod
+    def _cipher_key(eth_private_key: bytes) -> bytes:
+        return hashlib.sha256(b"paradex-key-cache" + eth_private_key).digest()
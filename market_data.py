@@ -0,0 +1,43 @@
+import logging
+import time
+from typing import Dict, List, Optional
+from ws_client import ParadexWSClient
+
+
+class BBO:
+    __slots__ = ("bid", "ask", "received_at")
+
+    def __init__(self, bid: float, ask: float, received_at: float):
+        self.bid = bid
+        self.ask = ask
+        self.received_at = received_at
+
+    def age(self) -> float:
+        return time.monotonic() - self.received_at
+
+
+class MarketDataFeed(ParadexWSClient):
+    def __init__(self, ws_url: str, markets: List[str], max_age: float = 5, **kwargs):
+        super().__init__(ws_url, **kwargs)
+        self.markets = markets
+        self.max_age = max_age
+        self._bbo: Dict[str, BBO] = {}
+
+    def channels(self) -> List[str]:
+        return [f"bbo.{market}" for market in self.markets]
+
+    async def on_message(self, channel: str, data: Dict) -> None:
+        if not data.get("bid") or not data.get("ask"):
+            return
+        self._bbo[data["market"]] = BBO(float(data["bid"]), float(data["ask"]), time.monotonic())
+
+    async def on_disconnect(self) -> None:
+        logging.warning("Market data feed disconnected, falling back to REST BBO")
+        self._bbo.clear()
+
+    def get_bbo(self, symbol: str) -> Optional[BBO]:
+        """Returns the latest BBO for symbol, or None if there is none or it is stale."""
+        bbo = self._bbo.get(symbol)
+        if bbo is None or bbo.age() > self.max_age:
+            return None
+        return bbo
@@ -0,0 +1,84 @@
+import asyncio
+import logging
+import time
+from typing import Dict, Optional
+from paradex_api_client import ParadexAPIClient
+
+
+def _optional_float(value) -> Optional[float]:
+    return float(value) if value not in (None, "") else None
+
+
+class MarketInfo:
+    __slots__ = ("symbol", "order_size_increment", "price_tick_size", "min_notional", "max_order_size", "position_limit")
+
+    def __init__(
+            self,
+            symbol: str,
+            order_size_increment: float,
+            price_tick_size: Optional[float] = None,
+            min_notional: Optional[float] = None,
+            max_order_size: Optional[float] = None,
+            position_limit: Optional[float] = None
+    ):
+        self.symbol = symbol
+        self.order_size_increment = order_size_increment
+        self.price_tick_size = price_tick_size
+        self.min_notional = min_notional
+        self.max_order_size = max_order_size
+        self.position_limit = position_limit
+
+    @classmethod
+    def from_dict(cls, market: Dict) -> "MarketInfo":
+        return cls(
+            symbol=market["symbol"],
+            order_size_increment=float(market["order_size_increment"]),
+            price_tick_size=_optional_float(market.get("price_tick_size")),
+            min_notional=_optional_float(market.get("min_notional")),
+            max_order_size=_optional_float(market.get("max_order_size")),
+            position_limit=_optional_float(market.get("position_limit")),
+        )
+
+
+class MarketsRegistry:
+    def __init__(self, api_client: ParadexAPIClient, ttl: float = 300):
+        self.api_client = api_client
+        self.ttl = ttl
+        self.loaded_at = 0.0
+        self._markets: Dict[str, MarketInfo] = {}
+        self._refresh_task: Optional[asyncio.Task] = None
+
+    async def load(self) -> None:
+        markets = await self.api_client.get_markets()
+        # Swap the whole index at once so readers never see a partial refresh
+        self._markets = {market["symbol"]: MarketInfo.from_dict(market) for market in markets}
+        self.loaded_at = time.monotonic()
+        logging.debug(f"Loaded {len(self._markets)} markets")
+
+    def get(self, symbol: str) -> MarketInfo:
+        market = self._markets.get(symbol)
+        if market is None:
+            raise Exception(f"Symbol {symbol} not found in markets")
+        return market
+
+    def start(self) -> None:
+        if self._refresh_task is None or self._refresh_task.done():
+            self._refresh_task = asyncio.create_task(self._refresh_loop())
+
+    async def stop(self) -> None:
+        if self._refresh_task is None:
+            return
+        self._refresh_task.cancel()
+        try:
+            await self._refresh_task
+        except asyncio.CancelledError:
+            pass
+        self._refresh_task = None
+
+    async def _refresh_loop(self) -> None:
+        while True:
+            await asyncio.sleep(self.ttl)
+            try:
+                await self.load()
+            except Exception as e:
+                logging.error(f"Failed to refresh markets, keeping the previous snapshot: {str(e)}")
@@ -0,0 +1,130 @@
+import itertools
+import logging
+import time
+from typing import Dict, Optional
+
+# Request-side states; acknowledged orders take the exchange status (NEW, OPEN, CLOSED)
+PENDING = "PENDING"
+REJECTED = "REJECTED"
+UNKNOWN = "UNKNOWN"
+
+
+def _base36(value: int) -> str:
+    digits = "0123456789abcdefghijklmnopqrstuvwxyz"
+    encoded = ""
+    while True:
+        value, remainder = divmod(value, 36)
+        encoded = digits[remainder] + encoded
+        if not value:
+            return encoded
+
+
+class ClientIds:
+    """
+    Deterministic client ids: `pb-<run>-<seq>-<leg>`. The run part is the process start time,
+    so ids are unique across restarts, and a given sequence number and leg always map to
+    the same id, so resending an order reuses its id.
+    """
+
+    def __init__(self, run_id: Optional[str] = None):
+        self.run_id = run_id or _base36(int(time.time() * 1000))
+        self._seq = itertools.count(1)
+
+    def next_seq(self) -> int:
+        return next(self._seq)
+
+    def make(self, seq: int, leg: str) -> str:
+        return f"pb-{self.run_id}-{seq}-{leg}"
+
+
+class OrderState:
+    __slots__ = ("client_id", "address", "market", "status", "order_id", "remaining_size", "cancel_reason", "updated_at")
+
+    def __init__(self, client_id: str, address: int, market: str):
+        self.client_id = client_id
+        self.address = address
+        self.market = market
+        self.status = PENDING
+        self.order_id: Optional[str] = None
+        self.remaining_size: Optional[str] = None
+        self.cancel_reason: Optional[str] = None
+        self.updated_at = time.monotonic()
+
+    @property
+    def acknowledged(self) -> bool:
+        return self.order_id is not None
+
+
+class OrderIndex:
+    """
+    client_id -> latest known order state, fed by POST /orders responses and the
+    ORDERS websocket channel, whichever arrives first. Entries are dropped `ttl`
+    seconds after their last update.
+    """
+
+    def __init__(self, ttl: float = 3600):
+        self.ttl = ttl
+        self._orders: Dict[str, OrderState] = {}
+        self._pruned_at = time.monotonic()
+
+    def __len__(self) -> int:
+        return len(self._orders)
+
+    def get(self, client_id: str) -> Optional[OrderState]:
+        return self._orders.get(client_id)
+
+    def on_submit(self, client_id: str, address: int, market: str) -> OrderState:
+        state = self._orders.get(client_id)
+        if state is None:
+            state = OrderState(client_id, address, market)
+            self._orders[client_id] = state
+            self._maybe_prune()
+        return state
+
+    def on_response(self, client_id: str, result) -> Optional[OrderState]:
+        state = self._orders.get(client_id)
+        if state is None:
+            return None
+        if state.acknowledged:
+            # The websocket ack won the race and is at least as recent as this response
+            pass
+        elif isinstance(result, dict) and result.get("id") and "error" not in result:
+            self._apply(state, result)
+        elif isinstance(result, dict):
+            state.status = REJECTED
+            state.cancel_reason = result.get("error")
+        else:
+            state.status = UNKNOWN
+        state.updated_at = time.monotonic()
+        return state
+
+    def on_order_update(self, data: Dict) -> None:
+        client_id = data.get("client_id")
+        if not client_id:
+            return
+        state = self._orders.get(client_id)
+        if state is None:
+            # Orders placed before a restart or from elsewhere are not tracked
+            return
+        self._apply(state, data)
+        state.updated_at = time.monotonic()
+        logging.debug(f"Order {client_id} is {state.status}")
+
+    def prune(self) -> int:
+        now = time.monotonic()
+        stale = [client_id for client_id, state in self._orders.items() if now - state.updated_at > self.ttl]
+        for client_id in stale:
+            del self._orders[client_id]
+        self._pruned_at = now
+        return len(stale)
+
+    def _maybe_prune(self) -> None:
+        if time.monotonic() - self._pruned_at > min(self.ttl, 60):
+            self.prune()
+
+    @staticmethod
+    def _apply(state: OrderState, data: Dict) -> None:
+        state.order_id = data.get("id") or state.order_id
+        state.status = data.get("status") or state.status
+        state.remaining_size = data.get("remaining_size", state.remaining_size)
+        state.cancel_reason = data.get("cancel_reason") or state.cancel_reason
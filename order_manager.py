@@ -1,13 +1,18 @@
-from paradex_api_client import ParadexAPIClient
+from paradex_api_client import MAX_BATCH_ORDERS, ParadexAPIClient
 from paradex_account import ParadexAccount
 from pair_order import PairOrder
 import logging
 import time
-from typing import Dict, List, Optional
+from typing import Dict, List, NamedTuple, Optional, Tuple
 from decimal import Decimal
 import asyncio
-from helpers.account import Account
+from concurrent.futures import Executor
+from helpers.account import SigningMixin, sign_template_batch_async
 from shared.paradex_api_utils import Order, OrderSide, OrderType
+from market_data import MarketDataFeed
+from account_state import AccountStateEngine
+from markets_registry import MarketInfo, MarketsRegistry
+from order_index import REJECTED, ClientIds, OrderIndex, OrderState
 
 def round_to_min_order_size(size: float, min_order_size: float) -> float:
     return round(size / min_order_size) * min_order_size
@@ -15,6 +20,16 @@ def round_to_min_order_size(size: float, min_order_size: float) -> float:
 def flatten_signature(sig: list[str]) -> str:
     return f'["{sig[0]}","{sig[1]}"]'
 
+def order_message(o: Order) -> Dict:
+    return {
+        "timestamp": o.signature_timestamp,  # Acts as a nonce
+        "market": o.market,  # As encoded short string
+        "side": o.order_side.chain_side(),  # 1: BUY, 2: SELL
+        "orderType": o.order_type.value,  # As encoded short string
+        "size": o.chain_size(),
+        "price": o.chain_price(),
+    }
+
 def order_sign_message(chainId: int, o: Order):
     message = {
         "domain": {"name": "Paradex", "chainId": hex(chainId), "version": "1"},
@@ -40,59 +55,323 @@ def order_sign_message(chainId: int, o: Order):
                 },  # Quantum value with 8 decimals; Limit price or 0 at the moment of signature
             ],
         },
-        "message": {
-            "timestamp": str(o.signature_timestamp),
-            "market": o.market,  # As encoded short string
-            "side": o.order_side.chain_side(),  # 1: BUY, 2: SELL
-            "orderType": o.order_type.value,  # As encoded short string
-            "size": o.chain_size(),
-            "price": o.chain_price(),
-        },
+        "message": order_message(o),
     }
     return message
 
 
-def sign_order(chain_id: int, account: Account, order: Order) -> str:
+def sign_order(chain_id: int, account: SigningMixin, order: Order) -> str:
     message = order_sign_message(chain_id, order)
     sig = account.sign_message(message)
     flat_sig = flatten_signature(sig)
     return flat_sig
 
+
+async def sign_order_async(chain_id: int, account: SigningMixin, order: Order, executor: Optional[Executor] = None) -> str:
+    sig = await account.sign_template_async("Order", chain_id, order_message(order), executor)
+    return flatten_signature(sig)
+
+class OrderSpec(NamedTuple):
+    account: ParadexAccount
+    order_type: OrderType
+    order_side: OrderSide
+    size: Decimal
+    market: str
+    client_id: str = ""
+    reduce_only: bool = False
+
+
+def order_accepted(result) -> bool:
+    return isinstance(result, dict) and "error" not in result and bool(result.get("id"))
+
+
+def filled_size(order: Order, ack: Dict) -> Decimal:
+    # A market order still working is assumed to fill; once CLOSED the exchange reports what was left unfilled
+    if ack.get("status") != "CLOSED":
+        return order.size
+    return max(Decimal(0), order.size - Decimal(str(ack.get("remaining_size") or 0)))
+
+
+def order_not_found(result) -> bool:
+    return isinstance(result, dict) and "NOT_FOUND" in str(result.get("error", ""))
+
+
+def order_rejected(result) -> bool:
+    # A transport error leaves the outcome unknown, only an error response is a definite rejection
+    return isinstance(result, dict) and not order_accepted(result)
+
+
+class UnwindStats:
+    """Latency from seeing a partial hedge failure to the unwind order being acknowledged."""
+    __slots__ = ("count", "failed", "total_ms", "max_ms")
+
+    def __init__(self):
+        self.count = 0
+        self.failed = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+
+    def record(self, latency_ms: float, ok: bool) -> None:
+        self.count += 1
+        self.failed += 0 if ok else 1
+        self.total_ms += latency_ms
+        self.max_ms = max(self.max_ms, latency_ms)
+
+    def __str__(self) -> str:
+        avg_ms = self.total_ms / self.count if self.count else 0.0
+        return f"{self.count} unwinds ({self.failed} failed), avg {avg_ms:.1f}ms, max {self.max_ms:.1f}ms"
+
+class PreparedPair:
+    """A hedge pair whose sizes are computed but whose orders are not signed yet."""
+    __slots__ = ("long_account", "short_account", "symbol", "value", "specs", "seq", "prepared_at")
+
+    def __init__(self, long_account: ParadexAccount, short_account: ParadexAccount, symbol: str, value: int, specs: List[OrderSpec], seq: int):
+        self.long_account = long_account
+        self.short_account = short_account
+        self.symbol = symbol
+        self.value = value
+        self.specs = specs
+        # Client ids derive from seq, so repricing or resending keeps them
+        self.seq = seq
+        self.prepared_at = time.monotonic()
+
+    @property
+    def accounts(self) -> Tuple[ParadexAccount, ParadexAccount]:
+        return self.long_account, self.short_account
+
+    def age(self) -> float:
+        return time.monotonic() - self.prepared_at
+
 class OrderManager:
-    def __init__(self, chain_id: int, api_client: ParadexAPIClient):
+    def __init__(
+            self,
+            chain_id: int,
+            api_client: ParadexAPIClient,
+            market_data: Optional[MarketDataFeed] = None,
+            account_state: Optional[AccountStateEngine] = None,
+            markets: Optional[MarketsRegistry] = None,
+            signing_executor: Optional[Executor] = None,
+            order_index: Optional[OrderIndex] = None
+    ):
         self.chain_id = chain_id
         self.api_client = api_client
-        self._market_cache = None
-
-    async def _get_min_order_size(self, symbol: str) -> float:
-        if not self._market_cache:
-            self._market_cache = await self.api_client.get_markets()
-        for market in self._market_cache:
-            if market["symbol"] == symbol:
-                return float(market["order_size_increment"])
-        raise Exception(f"Symbol {symbol} not found in markets")
+        self.market_data = market_data
+        self.account_state = account_state
+        self.markets = markets or MarketsRegistry(api_client)
+        self.signing_executor = signing_executor
+        self.unwind_stats = UnwindStats()
+        self.order_index = order_index or OrderIndex()
+        self.client_ids = ClientIds()
 
     async def create_and_submit_orders(self, long_acc: ParadexAccount, short_acc: ParadexAccount, symbol: str, value: int) -> Optional[PairOrder]:
         try:
-            bid, ask = await self._get_valid_bid_ask(symbol)
-            min_size = await self._get_min_order_size(symbol)
-            long_size, short_size = self._calculate_order_size(bid, ask, value, min_size)
-            long_order = self._build_signed_order(long_acc, OrderType.Market, OrderSide.Buy, Decimal(str(long_size)), symbol, "")
-            long_order = self._build_signed_order(long_acc, OrderType.Market, OrderSide.Buy, Decimal(str(long_size)), symbol, "")
-            short_order = self._build_signed_order(short_acc, OrderType.Market, OrderSide.Sell, Decimal(str(short_size)), symbol, "")
-            await self._submit_orders([long_acc, short_acc], [long_order, short_order])
-            pair_order = PairOrder(symbol)
-            pair_order.add_account(long_acc)
-            pair_order.add_account(short_acc)
-            return pair_order
+            prepared = await self.prepare_pair_orders(long_acc, short_acc, symbol, value)
+        except Exception as e:
+            logging.error(f"Error creating and submitting orders: {str(e)}")
+            return None
+        return await self.submit_prepared_pair(prepared)
+
+    async def prepare_pair_orders(self, long_acc: ParadexAccount, short_acc: ParadexAccount, symbol: str, value: int) -> PreparedPair:
+        # Everything but signing and submission, so it can run ahead of time
+        specs = await self._pair_order_specs(long_acc, short_acc, symbol, value)
+        return PreparedPair(long_acc, short_acc, symbol, value, specs, self.client_ids.next_seq())
+
+    async def submit_prepared_pair(self, prepared: PreparedPair) -> Optional[PairOrder]:
+        try:
+            if self._needs_reprice(prepared):
+                prepared.specs = await self._pair_order_specs(
+                    prepared.long_account, prepared.short_account, prepared.symbol, prepared.value
+                )
+                prepared.prepared_at = time.monotonic()
+            legs = ("L", "S")
+            specs = [
+                spec._replace(client_id=self.client_ids.make(prepared.seq, leg)) for spec, leg in zip(prepared.specs, legs)
+            ]
+            # Signed only now so the signature timestamp is fresh
+            orders = await self._build_signed_orders(specs)
+            unwind_specs = [
+                self._unwind_spec(spec, self.client_ids.make(prepared.seq, f"U{leg}")) for spec, leg in zip(specs, legs)
+            ]
+            # Lets a leg with an unknown outcome be checked against how far its position actually moved
+            positions_before = [self._position_size(account, prepared.symbol) for account in prepared.accounts]
+            submitted_at = time.monotonic()
+            # The reduce-only unwinds are signed while the legs are in flight, so a partial failure is unwound without signing
+            results, unwind_orders = await asyncio.gather(
+                self._submit_orders(list(prepared.accounts), orders),
+                self._build_signed_orders(unwind_specs),
+            )
+            if all(order_accepted(result) for result in results):
+                pair_order = PairOrder(prepared.symbol)
+                pair_order.add_account(prepared.long_account)
+                pair_order.add_account(prepared.short_account)
+                return pair_order
+            return await self._unwind_partial_pair(
+                prepared, orders, results, unwind_specs, unwind_orders, positions_before, submitted_at
+            )
 
         except Exception as e:
             logging.error(f"Error creating and submitting orders: {str(e)}")
             return None
 
+    def _unwind_spec(self, spec: OrderSpec, client_id: str) -> OrderSpec:
+        side = OrderSide.Sell if spec.order_side == OrderSide.Buy else OrderSide.Buy
+        return spec._replace(order_side=side, reduce_only=True, client_id=client_id)
+
+    def _position_size(self, account: ParadexAccount, market: str) -> Optional[Decimal]:
+        # Signed size from the account stream, None when there is no synced snapshot
+        snapshot = self.account_state.get_snapshot(account) if self.account_state else None
+        if snapshot is None:
+            return None
+        position = snapshot.positions.get(market)
+        if not position or position.get("status") != "OPEN":
+            return Decimal(0)
+        size = Decimal(str(abs(float(position["size"]))))
+        return size if position["side"] == "LONG" else -size
+
+    async def _resolve_unknown_leg(
+            self,
+            account: ParadexAccount,
+            order: Order,
+            position_before: Optional[Decimal]
+    ) -> Tuple[Decimal, bool]:
+        """
+        How much of a leg whose request failed in transit actually opened, and whether that is
+        certain. The account may already hold a position on the same side, which an unwind must
+        not touch, so without the exchange's word only what the position visibly moved is unwound.
+        """
+        state = self.order_index.get(order.client_id)
+        if state is not None and state.acknowledged:
+            return filled_size(order, self._ack(state)), True
+        if state is not None and state.status == REJECTED:
+            return Decimal(0), True
+        try:
+            found = await self.api_client.get_order_by_client_id(account.jwt, order.client_id)
+            if order_accepted(found):
+                return filled_size(order, found), True
+        except Exception as e:
+            logging.warning(f"Failed to look up order {order.client_id}: {str(e)}")
+        # Not found may only mean the exchange hasn't processed it yet, so this is never certain
+        position_after = self._position_size(account, order.market)
+        if position_before is None or position_after is None:
+            return Decimal(0), False
+        moved = (position_after - position_before) * order.order_side.sign()
+        if moved >= order.size:
+            return order.size, True
+        return max(Decimal(0), moved), False
+
+    async def _resend_if_absent(self, account: ParadexAccount, order: Order, error: Exception):
+        """
+        Resends an order whose request failed in transit, but only once the exchange confirms it
+        never received it. A second reduce-only unwind would shrink an older position instead.
+        """
+        state = self.order_index.get(order.client_id)
+        if state is not None and (state.acknowledged or state.status == REJECTED):
+            return self._ack(state) if state.acknowledged else {"error": state.cancel_reason or REJECTED}
+        try:
+            found = await self.api_client.get_order_by_client_id(account.jwt, order.client_id)
+        except Exception as e:
+            logging.warning(f"Failed to look up order {order.client_id}, not resending it: {str(e)}")
+            return error
+        if order_accepted(found):
+            self.order_index.on_order_update(found)
+            return found
+        if not order_not_found(found):
+            logging.warning(f"Lookup of order {order.client_id} was inconclusive, not resending it: {found!r}")
+            return error
+        return (await self._submit_orders([account], [order]))[0]
+
+    async def _unwind_partial_pair(
+            self,
+            prepared: PreparedPair,
+            leg_orders: List[Order],
+            results: List,
+            unwind_specs: List[OrderSpec],
+            unwind_orders: List[Order],
+            positions_before: List[Optional[Decimal]],
+            submitted_at: float
+    ) -> Optional[PairOrder]:
+        failed_at = time.monotonic()
+        for account, result in zip(prepared.accounts, results):
+            if not order_accepted(result):
+                logging.error(f"{prepared.symbol} leg for account {hex(account.account.address)} failed: {result!r}")
+        # Only legs known to have opened are unwound: a reduce-only order for a leg that never
+        # opened would shrink an older position of the same account instead
+        sizes = [
+            filled_size(order, result) if order_accepted(result) else Decimal(0) for order, result in zip(leg_orders, results)
+        ]
+        unknown = [i for i, result in enumerate(results) if not order_accepted(result) and not order_rejected(result)]
+        resolved = await asyncio.gather(*[
+            self._resolve_unknown_leg(prepared.accounts[i], leg_orders[i], positions_before[i]) for i in unknown
+        ])
+        # Legs that may have opened more than we can see stay tracked, so balance checks and cleanup close them
+        pair_order = PairOrder(prepared.symbol)
+        for i, (size, certain) in zip(unknown, resolved):
+            sizes[i] = size
+            if not certain:
+                logging.error(
+                    f"Outcome of {prepared.symbol} order {leg_orders[i].client_id} is unknown, "
+                    f"unwinding {size} and tracking account {hex(prepared.accounts[i].account.address)}"
+                )
+                pair_order.add_account(prepared.accounts[i])
+        legs = [i for i, size in enumerate(sizes) if size > 0]
+        if not legs:
+            return pair_order if pair_order.accounts else None
+
+        # A leg that opened only partly needs its unwind re-signed for the smaller size
+        partial = [i for i in legs if sizes[i] != leg_orders[i].size]
+        if partial:
+            resized = await self._build_signed_orders([unwind_specs[i]._replace(size=sizes[i]) for i in partial])
+            unwind_orders = list(unwind_orders)
+            for i, order in zip(partial, resized):
+                unwind_orders[i] = order
+        accounts = [prepared.accounts[i] for i in legs]
+        orders = [unwind_orders[i] for i in legs]
+        unwind_results = await self._submit_orders(accounts, orders)
+        retry = [i for i, result in enumerate(unwind_results) if isinstance(result, Exception)]
+        if retry:
+            retried = await asyncio.gather(*[self._resend_if_absent(accounts[i], orders[i], unwind_results[i]) for i in retry])
+            for i, result in zip(retry, retried):
+                unwind_results[i] = result
+        acked_at = time.monotonic()
+        latency_ms = (acked_at - failed_at) * 1000
+
+        # Legs whose unwind failed are tracked too
+        for account, result in zip(accounts, unwind_results):
+            if order_accepted(result):
+                continue
+            logging.error(f"Unwind of {prepared.symbol} for account {hex(account.account.address)} failed: {result!r}")
+            pair_order.add_account(account)
+        self.unwind_stats.record(latency_ms, ok=all(order_accepted(result) for result in unwind_results))
+        logging.warning(
+            f"Unwound {len(legs)} {prepared.symbol} leg(s) in {latency_ms:.1f}ms "
+            f"({(acked_at - submitted_at) * 1000:.1f}ms exposed), {self.unwind_stats}"
+        )
+        return pair_order if pair_order.accounts else None
+
+    def _needs_reprice(self, prepared: PreparedPair) -> bool:
+        # A live websocket quote costs nothing to re-read; a REST quote is only refetched once it is stale
+        if self.market_data is None:
+            return True
+        return self.market_data.get_bbo(prepared.symbol) is not None or prepared.age() > self.market_data.max_age
+
+    async def _pair_order_specs(self, long_acc: ParadexAccount, short_acc: ParadexAccount, symbol: str, value: int) -> List[OrderSpec]:
+        bid, ask = await self._get_valid_bid_ask(symbol)
+        market = self.markets.get(symbol)
+        long_size, short_size = self._calculate_order_size(bid, ask, value, market.order_size_increment)
+        self._validate_order_size(market, long_size, bid)
+        self._validate_order_size(market, short_size, ask)
+        return [
+            OrderSpec(long_acc, OrderType.Market, OrderSide.Buy, Decimal(str(long_size)), symbol),
+            OrderSpec(short_acc, OrderType.Market, OrderSide.Sell, Decimal(str(short_size)), symbol),
+        ]
+
     async def _get_valid_bid_ask(self, symbol: str) -> tuple[float, float]:
-        bbo = await self.api_client.get_bbo(symbol)
-        bid, ask = float(bbo["bid"]), float(bbo["ask"])
+        bbo = self.market_data.get_bbo(symbol) if self.market_data else None
+        if bbo:
+            bid, ask = bbo.bid, bbo.ask
+        else:
+            bbo = await self.api_client.get_bbo(symbol)
+            bid, ask = float(bbo["bid"]), float(bbo["ask"])
         if (ask - bid) / bid > 0.005:
             raise Exception("The bid-ask spread is too wide")
         return bid, ask
@@ -105,50 +384,174 @@ class OrderManager:
             round_to_min_order_size(value / ask, min_size)
         )
 
-    def _build_signed_order(self, account: ParadexAccount, order_type: OrderType, order_side: OrderSide, size: Decimal, market: str, client_id: str) -> Order:
-        order = Order(
-            market=market,
-            order_type=order_type,
-            order_side=order_side,
-            size=size,
-            client_id=client_id,
-            signature_timestamp=int(time.time()*1000),
-        )
-        sig = sign_order(self.chain_id, account.account, order)
-        order.signature = sig
-        return order
+    def _validate_order_size(self, market: MarketInfo, size: float, price: float) -> None:
+        if size <= 0:
+            raise Exception(f"Order size for {market.symbol} rounds down to zero")
+        if market.max_order_size is not None and size > market.max_order_size:
+            raise Exception(f"Order size {size} exceeds max order size {market.max_order_size} for {market.symbol}")
+        if market.min_notional is not None and size * price < market.min_notional:
+            raise Exception(f"Order notional {size * price} is below min notional {market.min_notional} for {market.symbol}")
 
-    async def _submit_orders(self, accounts: List[ParadexAccount], orders: List[Order]) -> Dict:
-        await asyncio.gather(
-            *[self.api_client.post_order(account.jwt, order.dump_to_dict()) for account, order in zip(accounts, orders)]
+    async def _build_signed_orders(self, specs: List[OrderSpec]) -> List[Order]:
+        # All orders are signed in one batch spread across the signing executor
+        orders = [
+            Order(
+                market=spec.market,
+                order_type=spec.order_type,
+                order_side=spec.order_side,
+                size=spec.size,
+                client_id=spec.client_id,
+                signature_timestamp=int(time.time()*1000),
+                flags=["REDUCE_ONLY"] if spec.reduce_only else None,
+            )
+            for spec in specs
+        ]
+        sigs = await sign_template_batch_async(
+            "Order",
+            self.chain_id,
+            [
+                (order_message(order), spec.account.account.address, spec.account.account.private_key)
+                for spec, order in zip(specs, orders)
+            ],
+            self.signing_executor,
         )
+        for order, sig in zip(orders, sigs):
+            order.signature = flatten_signature(sig)
+        return orders
+
+    async def _submit_orders(self, accounts: List[ParadexAccount], orders: List[Order]) -> List:
+        # One result per order: the response, or the exception if the request itself failed.
+        # A request carries one account's JWT, so only orders of the same account can share a batch.
+        groups: Dict[int, List[int]] = {}
+        for i, account in enumerate(accounts):
+            groups.setdefault(account.account.address, []).append(i)
+        results: List = [None] * len(orders)
+
+        async def submit_group(indexes: List[int]) -> None:
+            group_results = await self.submit_account_orders(accounts[indexes[0]], [orders[i] for i in indexes])
+            for i, result in zip(indexes, group_results):
+                results[i] = result
 
-    def _build_close_order(self, account: ParadexAccount, positions: List[Dict], symbol: str) -> Order:
+        await asyncio.gather(*[submit_group(indexes) for indexes in groups.values()])
+        return results
+
+    async def submit_account_orders(self, account: ParadexAccount, orders: List[Order]) -> List:
+        """Submits orders of one account, batched where the exchange supports it. One result per order."""
+        if len(orders) > 1 and self.api_client.batch_orders_supported:
+            return await self._submit_batch(account, orders)
+        return await asyncio.gather(*[self._submit_order(account, order) for order in orders], return_exceptions=True)
+
+    async def _submit_order(self, account: ParadexAccount, order: Order) -> Dict:
+        state = self.order_index.on_submit(order.client_id, account.account.address, order.market)
+        if state.acknowledged:
+            # Already on the exchange, resending the same client id is a no-op
+            return self._ack(state)
+        try:
+            result = await self.api_client.post_order(account.jwt, order.dump_to_dict())
+        except Exception as e:
+            result = e
+        result = self._record_result(order, state, result)
+        if isinstance(result, Exception):
+            raise result
+        return result
+
+    async def _submit_batch(self, account: ParadexAccount, orders: List[Order]) -> List:
+        states = [self.order_index.on_submit(order.client_id, account.account.address, order.market) for order in orders]
+        results: List = [self._ack(state) if state.acknowledged else None for state in states]
+        pending = [i for i, result in enumerate(results) if result is None]
+
+        async def submit_chunk(chunk: List[int]) -> None:
+            try:
+                batch = await self.api_client.post_orders_batch(account.jwt, [orders[i].dump_to_dict() for i in chunk])
+            except Exception as e:
+                batch = [e] * len(chunk)
+            if batch is None:
+                # Batch endpoint unavailable, fall back to one request per order
+                batch = await asyncio.gather(*[self._submit_order(account, orders[i]) for i in chunk], return_exceptions=True)
+            else:
+                batch = [self._record_result(orders[i], states[i], result) for i, result in zip(chunk, batch)]
+            for i, result in zip(chunk, batch):
+                results[i] = result
+
+        await asyncio.gather(*[
+            submit_chunk(pending[start:start + MAX_BATCH_ORDERS]) for start in range(0, len(pending), MAX_BATCH_ORDERS)
+        ])
+        return results
+
+    def _record_result(self, order: Order, state: OrderState, result):
+        self.order_index.on_response(order.client_id, result)
+        if isinstance(result, Exception) and state.acknowledged:
+            # The request failed on our side but the ORDERS channel saw the exchange accept it
+            return self._ack(state)
+        return result
+
+    @staticmethod
+    def _ack(state: OrderState) -> Dict:
+        return {
+            "id": state.order_id, "client_id": state.client_id, "status": state.status, "remaining_size": state.remaining_size
+        }
+
+    def order_status(self, client_id: str) -> Optional[OrderState]:
+        return self.order_index.get(client_id)
+
+    async def _get_positions(self, account: ParadexAccount) -> List[Dict]:
+        if self.account_state:
+            return await self.account_state.get_positions(account)
+        return await self.api_client.get_positions(account.jwt)
+
+    def _close_order_spec(self, account: ParadexAccount, positions: List[Dict], symbol: str, client_id: str = "") -> Optional[OrderSpec]:
         for position in positions:
             if position["market"] == symbol and position["status"] == "OPEN":
                 side = OrderSide.Sell if position["side"] == "LONG" else OrderSide.Buy
                 size = Decimal(str(abs(float(position["size"]))))
-                return self._build_signed_order(
-                    account=account, 
-                    order_type=OrderType.Market, 
-                    order_side=side, 
-                    size=size, 
-                    market=symbol, 
-                    client_id=""
-                )
+                return OrderSpec(account, OrderType.Market, side, size, symbol, client_id, reduce_only=True)
         return None
 
-    async def create_and_submit_close_pair_order(self, pair_order: PairOrder) -> tuple[Order, Order]:
+    def _pair_close_specs(self, pair_order: PairOrder, positions: Dict[int, List[Dict]]) -> List[OrderSpec]:
+        close_specs = []
+        seq = self.client_ids.next_seq()
+        for leg, account in enumerate(pair_order.accounts):
+            client_id = self.client_ids.make(seq, f"C{leg}")
+            close_spec = self._close_order_spec(account, positions[account.account.address], pair_order.symbol, client_id)
+            if close_spec:
+                close_specs.append(close_spec)
+        return close_specs
+
+    async def build_close_orders(
+            self,
+            pair_orders: List[PairOrder],
+            positions: Dict[int, List[Dict]]
+    ) -> List[Tuple[PairOrder, OrderSpec, Order]]:
+        """
+        Signed reduce-only close orders for every open leg of pair_orders, given each account's
+        positions by address. All orders are signed in one batch; nothing is submitted.
+        """
+        closes = [(pair_order, spec) for pair_order in pair_orders for spec in self._pair_close_specs(pair_order, positions)]
+        orders = await self._build_signed_orders([spec for _, spec in closes])
+        return [(pair_order, spec, order) for (pair_order, spec), order in zip(closes, orders)]
+
+    async def create_and_submit_close_pair_order(self, pair_order: PairOrder) -> Optional[List[Order]]:
         try:
-            close_orders = []
-            close_accounts = []
-            for account in pair_order.accounts:
-                open_positions = await self.api_client.get_positions(account.jwt)
-                close_order = self._build_close_order(account, open_positions, pair_order.symbol)
-                if close_order:
-                    close_orders.append(close_order)
-                    close_accounts.append(account)
-            await self._submit_orders(close_accounts, close_orders)
+            accounts = list(pair_order.accounts)
+            results = await asyncio.gather(*[self._get_positions(account) for account in accounts], return_exceptions=True)
+            failed = [(account, result) for account, result in zip(accounts, results) if isinstance(result, Exception)]
+            for account, error in failed:
+                logging.error(f"Failed to fetch positions for account {hex(account.account.address)}: {str(error)}")
+            if failed:
+                # Closing only the legs we could read would leave the pair unhedged
+                raise Exception(f"Positions unavailable for {len(failed)} of {len(accounts)} accounts in {pair_order.symbol} pair")
+            close_specs = self._pair_close_specs(
+                pair_order, {account.account.address: positions for account, positions in zip(accounts, results)}
+            )
+            close_orders = await self._build_signed_orders(close_specs)
+            results = await self._submit_orders([spec.account for spec in close_specs], close_orders)
+            failed = [(spec, result) for spec, result in zip(close_specs, results) if not order_accepted(result)]
+            if failed:
+                # The pair stays tracked; a retry only re-closes the legs that are still open
+                for spec, result in failed:
+                    logging.error(f"Close of {pair_order.symbol} for account {hex(spec.account.account.address)} failed: {result!r}")
+                return None
+            return close_orders
         except Exception as e:
             logging.error(f"Error creating and submitting close orders: {str(e)}")
-            return None, None
+            return None
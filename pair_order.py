@@ -1,9 +1,27 @@
+import itertools
+import time
+from typing import Iterator
 from paradex_account import ParadexAccount
 
+_pair_ids = itertools.count(1)
+
+
 class PairOrder:
+    __slots__ = ("pair_id", "symbol", "accounts", "created_at", "updated_at")
+
     def __init__(self, symbol: str):
+        self.pair_id = next(_pair_ids)
         self.accounts = set()
         self.symbol = symbol
+        self.created_at = time.monotonic()
+        self.updated_at = self.created_at
 
     def add_account(self, account: ParadexAccount):
         self.accounts.add(account)
+        self.touch()
+
+    def touch(self) -> None:
+        self.updated_at = time.monotonic()
+
+    def addresses(self) -> Iterator[int]:
+        return (account.account.address for account in self.accounts)
@@ -0,0 +1,122 @@
+import asyncio
+import logging
+import time
+from typing import Callable, Dict, Iterator, List, Optional, Set, Tuple
+from pair_order import PairOrder
+
+
+class PairRegistry:
+    """
+    Open hedge pairs indexed by pair id, by (market, account address) and by market and account.
+    Addresses are the integer account addresses, so lookups never format them.
+    """
+
+    def __init__(self, ttl: float = 3600):
+        self.ttl = ttl
+        self._pairs: Dict[int, PairOrder] = {}
+        self._by_leg: Dict[Tuple[str, int], PairOrder] = {}
+        self._by_market: Dict[str, Set[int]] = {}
+        self._by_account: Dict[int, Set[int]] = {}
+        self._prune_task: Optional[asyncio.Task] = None
+
+    def __len__(self) -> int:
+        return len(self._pairs)
+
+    def __iter__(self) -> Iterator[PairOrder]:
+        return iter(list(self._pairs.values()))
+
+    def get(self, symbol: str, address: int) -> Optional[PairOrder]:
+        return self._by_leg.get((symbol, address))
+
+    def get_by_id(self, pair_id: int) -> Optional[PairOrder]:
+        return self._pairs.get(pair_id)
+
+    def for_market(self, symbol: str) -> List[PairOrder]:
+        return [self._pairs[pair_id] for pair_id in self._by_market.get(symbol, ())]
+
+    def for_account(self, address: int) -> List[PairOrder]:
+        return [self._pairs[pair_id] for pair_id in self._by_account.get(address, ())]
+
+    def add(self, pair_order: PairOrder) -> PairOrder:
+        # An account holds one position per market, so a new pair sharing a leg with an existing one is merged into it
+        existing = {self._by_leg[(pair_order.symbol, address)] for address in pair_order.addresses()
+                    if (pair_order.symbol, address) in self._by_leg}
+        if not existing:
+            self._index(pair_order)
+            return pair_order
+        target = min(existing, key=lambda pair: pair.pair_id)
+        for pair in existing | {pair_order}:
+            if pair is target:
+                continue
+            if pair.pair_id in self._pairs:
+                self.remove(pair)
+            for account in pair.accounts:
+                target.add_account(account)
+        self._index(target)
+        return target
+
+    def remove(self, pair_order: PairOrder) -> None:
+        if self._pairs.pop(pair_order.pair_id, None) is None:
+            return
+        for address in pair_order.addresses():
+            if self._by_leg.get((pair_order.symbol, address)) is pair_order:
+                del self._by_leg[(pair_order.symbol, address)]
+            self._discard(self._by_account, address, pair_order.pair_id)
+        self._discard(self._by_market, pair_order.symbol, pair_order.pair_id)
+
+    def prune(self, is_open: Callable[[PairOrder], bool]) -> List[PairOrder]:
+        """
+        Drops pairs not touched for `ttl` seconds whose positions `is_open` reports closed,
+        e.g. after a liquidation or a failed close that was finished by hand. Pairs that
+        are still open are touched and checked again one `ttl` later.
+        """
+        now = time.monotonic()
+        pruned = []
+        for pair_order in list(self._pairs.values()):
+            if now - pair_order.updated_at < self.ttl:
+                continue
+            if is_open(pair_order):
+                pair_order.touch()
+                continue
+            self.remove(pair_order)
+            pruned.append(pair_order)
+        return pruned
+
+    def start(self, is_open: Callable[[PairOrder], bool]) -> None:
+        if self._prune_task is None or self._prune_task.done():
+            self._prune_task = asyncio.create_task(self._prune_loop(is_open))
+
+    async def stop(self) -> None:
+        if self._prune_task is None:
+            return
+        self._prune_task.cancel()
+        try:
+            await self._prune_task
+        except asyncio.CancelledError:
+            pass
+        self._prune_task = None
+
+    def _index(self, pair_order: PairOrder) -> None:
+        self._pairs[pair_order.pair_id] = pair_order
+        for address in pair_order.addresses():
+            self._by_leg[(pair_order.symbol, address)] = pair_order
+            self._by_account.setdefault(address, set()).add(pair_order.pair_id)
+        self._by_market.setdefault(pair_order.symbol, set()).add(pair_order.pair_id)
+
+    @staticmethod
+    def _discard(index: Dict, key, pair_id: int) -> None:
+        pair_ids = index.get(key)
+        if pair_ids is None:
+            return
+        pair_ids.discard(pair_id)
+        if not pair_ids:
+            del index[key]
+
+    async def _prune_loop(self, is_open: Callable[[PairOrder], bool]) -> None:
+        while True:
+            await asyncio.sleep(min(self.ttl, 60))
+            try:
+                for pair_order in self.prune(is_open):
+                    logging.info(f"Pruned stale {pair_order.symbol} pair {pair_order.pair_id}")
+            except Exception as e:
+                logging.error(f"Failed to prune pairs: {str(e)}")
@@ -1,4 +1,4 @@
-from utils import get_account
+from utils import get_signer_account
 from typing import Dict
 
 class ParadexAccount:
@@ -7,7 +7,7 @@ class ParadexAccount:
         self.jwt = None
 
     def _get_account(self, private_key: str, account_address: str, paradex_config: Dict):
-        return get_account(account_address, private_key, paradex_config)
+        return get_signer_account(account_address, private_key, paradex_config)
 
     def update_jwt(self, jwt: str):
         self.jwt = jwt
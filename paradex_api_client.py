@@ -1,20 +1,158 @@
 import aiohttp
-from typing import Dict, List
+import asyncio
+import time
+from typing import Awaitable, Callable, Dict, List, Optional, Tuple
 import logging
 
+# POST /orders/batch accepts at most this many orders per request
+MAX_BATCH_ORDERS = 10
+
+
 class ParadexAPIClient:
-    def __init__(self, base_url: str):
+    def __init__(
+            self,
+            base_url: str,
+            pool_size: int = 100,
+            pool_size_per_host: int = 0,
+            keepalive_timeout: float = 30,
+            dns_cache_ttl: int = 300,
+            request_timeout: float = 10,
+            public_cache_ttl: float = 0
+    ):
         self.base_url = base_url
+        self.pool_size = pool_size
+        self.pool_size_per_host = pool_size_per_host
+        self.keepalive_timeout = keepalive_timeout
+        self.dns_cache_ttl = dns_cache_ttl
+        self.request_timeout = request_timeout
+        self.public_cache_ttl = public_cache_ttl
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._inflight: Dict[str, asyncio.Task] = {}
+        self._response_cache: Dict[str, Tuple[float, Dict]] = {}
+        # Cleared the first time the batch endpoint answers as missing, callers then post orders one by one
+        self.batch_orders_supported = True
+        # Called with a token the server refused, returns a fresh token for the same account or None
+        self.reauth_handler: Optional[Callable[[str], Awaitable[Optional[str]]]] = None
+        self.reauth_count = 0
+        self.reauth_failures = 0
+
+    async def open(self) -> None:
+        if self._session and not self._session.closed:
+            return
+        connector = aiohttp.TCPConnector(
+            limit=self.pool_size,
+            limit_per_host=self.pool_size_per_host,
+            keepalive_timeout=self.keepalive_timeout,
+            use_dns_cache=True,
+            ttl_dns_cache=self.dns_cache_ttl,
+        )
+        self._session = aiohttp.ClientSession(
+            connector=connector,
+            timeout=aiohttp.ClientTimeout(total=self.request_timeout),
+        )
+        logging.debug(f"Opened HTTP session for {self.base_url} (pool size: {self.pool_size})")
+
+    async def close(self) -> None:
+        if self._session and not self._session.closed:
+            await self._session.close()
+            logging.debug(f"Closed HTTP session for {self.base_url}")
+        self._session = None
+
+    async def __aenter__(self) -> "ParadexAPIClient":
+        await self.open()
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        await self.close()
+
+    @property
+    def session(self) -> aiohttp.ClientSession:
+        if not self._session or self._session.closed:
+            raise RuntimeError("ParadexAPIClient session is not open, call open() first")
+        return self._session
 
     async def _request(
             self, method: str, endpoint: str,
             jwt: str = None, payload: Dict = None
     ) -> Dict:
+        if method == "GET" and not jwt and payload is None:
+            return await self._coalesced_get(endpoint)
+        return await self._send(method, endpoint, jwt, payload)
+
+    async def _send(
+            self, method: str, endpoint: str,
+            jwt: str = None, payload: Dict = None
+    ) -> Dict:
+        _, body = await self._with_reauth(jwt, lambda token: self._send_once(method, endpoint, token, payload))
+        return body
+
+    async def _send_once(self, method: str, endpoint: str, jwt: Optional[str], payload: Optional[Dict]) -> Tuple[int, Dict]:
         url = f"{self.base_url}/{endpoint}"
         headers = {"Authorization": f"Bearer {jwt}"} if jwt else {}
-        async with aiohttp.ClientSession() as session:
-            async with session.request(method, url, headers=headers, json=payload) as response:
-                return await response.json()
+        async with self.session.request(method, url, headers=headers, json=payload) as response:
+            return response.status, await response.json()
+
+    async def _with_reauth(
+            self, jwt: Optional[str],
+            send: Callable[[Optional[str]], Awaitable[Tuple[int, Dict]]]
+    ) -> Tuple[int, Dict]:
+        # A 401 on an authenticated request is retried once with a fresh token for the same account
+        status, body = await send(jwt)
+        if status != 401 or not jwt or self.reauth_handler is None:
+            return status, body
+        new_jwt = await self._reauthenticate(jwt, body)
+        if new_jwt is None:
+            return status, body
+        return await send(new_jwt)
+
+    async def _reauthenticate(self, jwt: str, body: Dict) -> Optional[str]:
+        self.reauth_count += 1
+        reason = body.get("message") if isinstance(body, dict) else body
+        try:
+            new_jwt = await self.reauth_handler(jwt)
+        except Exception as e:
+            logging.error(f"Re-authentication failed: {str(e)}")
+            new_jwt = None
+        if not new_jwt or new_jwt == jwt:
+            self.reauth_failures += 1
+            logging.error(f"Request refused with 401 and no fresh token is available: {reason}")
+            return None
+        logging.info(f"Re-authenticated after 401 ({reason}), {self.reauth_count} so far")
+        return new_jwt
+
+    async def _coalesced_get(self, endpoint: str) -> Dict:
+        # Identical concurrent public GETs share one request; responses are shared, so callers must not mutate them
+        if self.public_cache_ttl > 0:
+            cached = self._response_cache.get(endpoint)
+            if cached and time.monotonic() - cached[0] < self.public_cache_ttl:
+                return cached[1]
+        task = self._inflight.get(endpoint)
+        if task is None:
+            task = asyncio.ensure_future(self._send("GET", endpoint))
+            self._inflight[endpoint] = task
+            task.add_done_callback(lambda t: self._on_public_get_done(endpoint, t))
+        return await asyncio.shield(task)
+
+    def _on_public_get_done(self, endpoint: str, task: asyncio.Task) -> None:
+        if self._inflight.get(endpoint) is task:
+            del self._inflight[endpoint]
+        if task.cancelled() or task.exception() is not None:
+            return
+        if self.public_cache_ttl > 0:
+            self._response_cache[endpoint] = (time.monotonic(), task.result())
+
+    async def auth(self, headers: Dict) -> Dict:
+        url = f"{self.base_url}/auth"
+        async with self.session.post(url, headers=headers) as response:
+            status_code: int = response.status
+            response: Dict = await response.json()
+            if status_code == 200:
+                logging.info("Get JWT successful")
+            else:
+                logging.error(f"Status Code: {status_code}")
+                logging.error(f"Response Text: {response}")
+                logging.error("Unable to POST /auth")
+            return response
 
     async def get_config(self) -> Dict:
         return await self._request("GET", "system/config", None, None)
@@ -22,6 +160,42 @@ class ParadexAPIClient:
     async def post_order(self, jwt: str, payload: Dict) -> Dict:
         return await self._request("POST", "orders", jwt, payload)
 
+    async def post_orders_batch(self, jwt: str, payloads: List[Dict]) -> Optional[List]:
+        """
+        Submits up to MAX_BATCH_ORDERS orders of one account in a single request. Returns one
+        result per order, in order (the order or an error dict), or None if batching is unsupported.
+        """
+        if not self.batch_orders_supported:
+            return None
+        url = f"{self.base_url}/orders/batch"
+
+        async def send(token: str) -> Tuple[int, Optional[Dict]]:
+            async with self.session.post(url, headers={"Authorization": f"Bearer {token}"}, json=payloads) as response:
+                if response.status in (404, 405, 501):
+                    return response.status, None
+                return response.status, await response.json(content_type=None)
+
+        status, body = await self._with_reauth(jwt, send)
+        if status in (404, 405, 501):
+            self.batch_orders_supported = False
+            logging.warning(f"POST /orders/batch returned {status}, submitting orders individually")
+            return None
+        return self._split_batch_response(body, len(payloads))
+
+    @staticmethod
+    def _split_batch_response(body, count: int) -> List:
+        if isinstance(body, list) and len(body) == count:
+            return body
+        if isinstance(body, dict) and isinstance(body.get("orders"), list):
+            orders = body["orders"]
+            errors = body.get("errors") or [None] * count
+            if len(orders) == count and len(errors) == count:
+                return [error if error else order for order, error in zip(orders, errors)]
+        if isinstance(body, dict) and "error" in body:
+            # The whole batch was refused, so no order in it was placed
+            return [body] * count
+        raise Exception(f"Unexpected POST /orders/batch response: {body}")
+
     async def get_positions(self, jwt: str) -> Dict:
         response = await self._request("GET", "positions", jwt, None)
         return response["results"]
@@ -41,6 +215,9 @@ class ParadexAPIClient:
         logging.debug(f"response: {response}")
         return response["results"]
 
+    async def get_order_by_client_id(self, jwt: str, client_id: str) -> Dict:
+        return await self._request("GET", f"orders/by_client_id/{client_id}", jwt, None)
+
     async def cancel_orders(self, jwt: str) -> Dict:
         return await self._request("DELETE", "orders", jwt, None)
 
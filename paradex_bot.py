@@ -1,14 +1,25 @@
-from typing import List, Dict
+from typing import List, Dict, Optional, Tuple
 import logging
 import time
 import random
-import aiohttp
 import asyncio
+from concurrent.futures import ProcessPoolExecutor
 from paradex_api_client import ParadexAPIClient
 from paradex_account import ParadexAccount
 from pair_order import PairOrder
-from order_manager import OrderManager
-from utils import int_from_bytes, build_auth_message, generate_paradex_account
+from pair_registry import PairRegistry
+from order_index import OrderIndex
+from order_manager import OrderManager, PreparedPair
+from jwt_manager import JWTManager
+from cleanup_engine import CleanupEngine, CleanupReport
+from key_cache import KeyCache
+from market_data import MarketDataFeed
+from account_state import AccountStateEngine
+from account_lease import AccountLeaseManager
+from markets_registry import MarketsRegistry
+from ws_client import ws_url_from_http_url
+from helpers.account import create_signing_executor
+from utils import int_from_bytes, auth_request_message, generate_paradex_account
 
 class ParadexBot:
     def __init__(
@@ -16,46 +27,157 @@ class ParadexBot:
             paradex_http_url: str,
             markets: List[str],
             order_size_range: List[int],
-            cool_down_time_seconds_between_orders_range: List[int]
+            cool_down_time_seconds_between_orders_range: List[int],
+            http_pool_config: Optional[Dict] = None,
+            jwt_refresh_margin_seconds: float = 60,
+            key_derivation_workers: Optional[int] = None,
+            auth_concurrency: int = 20,
+            key_cache_path: Optional[str] = None,
+            paradex_ws_url: Optional[str] = None,
+            bbo_max_age_seconds: float = 5,
+            pair_workers: int = 1,
+            markets_ttl_seconds: float = 300,
+            signing_pool_config: Optional[Dict] = None,
+            prefetch_next_pair: bool = True,
+            cleanup_concurrency: int = 20,
+            cleanup_deadline_seconds: float = 8,
+            pair_ttl_seconds: float = 3600
     ):
         self.paradex_http_url = paradex_http_url
         self.markets = markets
         self.order_size_range = order_size_range
         self.cool_down_time_seconds_between_orders_range = cool_down_time_seconds_between_orders_range
+        self.http_pool_config = http_pool_config or {}
+        self.jwt_refresh_margin_seconds = jwt_refresh_margin_seconds
+        self.key_derivation_workers = key_derivation_workers
+        self.auth_concurrency = auth_concurrency
+        self.key_cache_path = key_cache_path
+        self.paradex_ws_url = paradex_ws_url or ws_url_from_http_url(paradex_http_url)
+        self.bbo_max_age_seconds = bbo_max_age_seconds
+        self.pair_workers = pair_workers
+        self.markets_ttl_seconds = markets_ttl_seconds
+        self.signing_pool_config = signing_pool_config or {}
+        self.prefetch_next_pair = prefetch_next_pair
+        self.cleanup_concurrency = cleanup_concurrency
+        self.cleanup_deadline_seconds = cleanup_deadline_seconds
         self.accounts = []
-        self.order_dict = {}
+        self.pairs = PairRegistry(ttl=pair_ttl_seconds)
+        self.closing_pairs: Dict[int, asyncio.Event] = {}
+        # loop.time() of the shutdown signal, the cleanup deadline counts from here
+        self.shutdown_requested_at: Optional[float] = None
 
     # These will be initialized in setup()
         self.paradex_config = None
         self.chain_id = None
         self.api_client = None
         self.order_manager = None
+        self.jwt_manager = None
+        self.market_data = None
+        self.account_state = None
+        self.lease_manager = None
+        self.markets_registry = None
+        self.signing_executor = None
+        self.order_index = None
 
     async def setup(self):
-        self.api_client = ParadexAPIClient(self.paradex_http_url)
+        self.api_client = ParadexAPIClient(self.paradex_http_url, **self.http_pool_config)
+        await self.api_client.open()
         self.paradex_config = await self.api_client.get_config()
         self.chain_id = int_from_bytes(self.paradex_config["starknet_chain_id"].encode())
-        self.order_manager = OrderManager(self.chain_id, self.api_client)
+        self.market_data = MarketDataFeed(self.paradex_ws_url, self.markets, max_age=self.bbo_max_age_seconds)
+        self.market_data.start()
+        self.order_index = OrderIndex()
+        self.account_state = AccountStateEngine(
+            self.paradex_ws_url, self.api_client, self.order_index, snapshot_concurrency=self.auth_concurrency
+        )
+        self.markets_registry = MarketsRegistry(self.api_client, ttl=self.markets_ttl_seconds)
+        await self.markets_registry.load()
+        self.markets_registry.start()
+        self.signing_executor = create_signing_executor(**self.signing_pool_config)
+        self.order_manager = OrderManager(
+            self.chain_id, self.api_client, self.market_data, self.account_state, self.markets_registry,
+            self.signing_executor, self.order_index
+        )
+        self.jwt_manager = JWTManager(
+            self._get_jwt_token, refresh_margin=self.jwt_refresh_margin_seconds, concurrency=self.auth_concurrency
+        )
+        self.jwt_manager.start()
+        self.api_client.reauth_handler = self.jwt_manager.reauthenticate
 
     async def setup_accounts(self, private_keys: List[str]):
-        for private_key in private_keys:
-            paradex_account_address, paradex_account_private_key_hex = generate_paradex_account(
-                self.paradex_config, private_key
+        # Keys are derived in a process pool while the /auth calls run concurrently behind a semaphore
+        loop = asyncio.get_running_loop()
+        semaphore = asyncio.Semaphore(self.auth_concurrency)
+        progress = {"done": 0, "failed": 0, "total": len(private_keys)}
+        key_cache = KeyCache(self.key_cache_path, self.paradex_config) if self.key_cache_path else None
+        if key_cache:
+            key_cache.load()
+        with ProcessPoolExecutor(max_workers=self.key_derivation_workers) as executor:
+            derivations = [
+                asyncio.ensure_future(self._derive_account(loop, executor, key_cache, private_key))
+                for private_key in private_keys
+            ]
+            accounts = await asyncio.gather(
+                *[self._bootstrap_account(index, derivation, semaphore, progress) for index, derivation in enumerate(derivations)]
             )
+        if key_cache:
+            key_cache.save()
+        self.accounts.extend(account for account in accounts if account is not None)
+        logging.info(f"Loaded {len(self.accounts)} accounts, {progress['failed']} failed")
+
+    async def _derive_account(
+            self,
+            loop: asyncio.AbstractEventLoop,
+            executor: ProcessPoolExecutor,
+            key_cache: Optional[KeyCache],
+            private_key: str
+    ) -> Tuple[str, str]:
+        if key_cache:
+            cached = key_cache.get(private_key)
+            if cached:
+                return cached
+        paradex_account_address, paradex_account_private_key_hex = await loop.run_in_executor(
+            executor, generate_paradex_account, self.paradex_config, private_key
+        )
+        if key_cache:
+            key_cache.put(private_key, paradex_account_address, paradex_account_private_key_hex)
+        return paradex_account_address, paradex_account_private_key_hex
+
+    async def _bootstrap_account(
+            self,
+            index: int,
+            derivation: asyncio.Future,
+            semaphore: asyncio.Semaphore,
+            progress: Dict
+    ) -> Optional[ParadexAccount]:
+        try:
+            paradex_account_address, paradex_account_private_key_hex = await derivation
             account = ParadexAccount(paradex_account_private_key_hex, paradex_account_address, self.paradex_config)
-            jwt = await self._get_jwt_token(account)
-            account.update_jwt(jwt)
-            self.accounts.append(account)
+            async with semaphore:
+                await self.update_jwt(account)
+            self.account_state.add_account(account)
+            return account
+        except Exception as e:
+            progress["failed"] += 1
+            logging.error(f"Failed to set up account #{index + 1}: {str(e)}")
+            return None
+        finally:
+            progress["done"] += 1
+            step = max(1, progress["total"] // 20)
+            if progress["done"] % step == 0 or progress["done"] == progress["total"]:
+                logging.info(f"Account setup progress: {progress['done']}/{progress['total']} ({progress['failed']} failed)")
 
     async def update_jwt(self, account: ParadexAccount):
-        jwt = await self._get_jwt_token(account)
+        # Served from the cache unless the token is about to expire
+        jwt = await self.jwt_manager.get_token(account)
         account.update_jwt(jwt)
 
     async def _get_jwt_token(self, account: ParadexAccount):
         now = int(time.time())
         expiry = now + 24 * 60 * 60
-        message = build_auth_message(self.chain_id, now, expiry)
-        sig = account.account.sign_message(message)
+        sig = await account.account.sign_template_async(
+            "Request", self.chain_id, auth_request_message(now, expiry), self.signing_executor
+        )
 
         headers: Dict = {
             "PARADEX-STARKNET-ACCOUNT": hex(account.account.address),
@@ -64,158 +186,200 @@ class ParadexBot:
             "PARADEX-SIGNATURE-EXPIRATION": str(expiry),
         }
 
-        url = self.paradex_http_url + '/auth'
-
-        logging.info(f"POST {url}")
+        logging.info(f"POST {self.paradex_http_url}/auth")
         logging.info(f"Headers: {headers}")
 
-        async with aiohttp.ClientSession() as session:
-            async with session.post(url, headers=headers) as response:
-                status_code: int = response.status
-                response: Dict = await response.json()
-                if status_code == 200:
-                    logging.info(f"Success: {response}")
-                    logging.info("Get JWT successful")
-                else:
-                    logging.error(f"Status Code: {status_code}")
-                    logging.error(f"Response Text: {response}")
-                    logging.error("Unable to POST /auth")
-                token = response["jwt_token"]
-        return token
+        response = await self.api_client.auth(headers)
+        return response["jwt_token"]
 
 
     async def handle_account_balance(
             self,
             account: ParadexAccount,
-            required_value: int
+            required_value: int,
+            leased_accounts: Tuple[ParadexAccount, ...] = ()
     ) -> None:
         try:
-            balance = await self.order_manager.api_client.get_balance(account.jwt)
-            # TODO: check this, next???
-            usdc_balance = next(
-                (float(item["size"]) for item in balance if item["token"] == "USDC"),
-                0.0
-            )
+            usdc_balance = await self.account_state.get_usdc_balance(account)
             if usdc_balance >= required_value:
                 return
 
             logging.info(f"Insufficient USDC balance for account {hex(account.account.address)}, closing positions...")
 
-            open_positions = await self.order_manager.api_client.get_positions(account.jwt)
+            open_positions = await self.account_state.get_positions(account)
             for position in open_positions:
                 if position["status"] != "OPEN":
                     continue
                 symbol = position["market"]
-                order_key = f"{symbol}-{hex(account.account.address)}"
-                if order_key not in self.order_dict:
+                order_pair = self.pairs.get(symbol, account.account.address)
+                if order_pair is None:
+                    continue
+                # Both legs of a pair are checked concurrently; the second one waits for the first one's close
+                closing = self.closing_pairs.get(order_pair.pair_id)
+                if closing:
+                    await closing.wait()
                     continue
-                order_pair = self.order_dict[order_key]
 
+                # The counterparty may be trading in another worker's pair right now
+                counterparties = [acc for acc in order_pair.accounts if acc not in leased_accounts]
+                if self.lease_manager and not self.lease_manager.try_acquire(counterparties):
+                    logging.info(f"Counterparty of {symbol} pair for account {hex(account.account.address)} is busy, skipping close")
+                    continue
+                self.closing_pairs[order_pair.pair_id] = asyncio.Event()
                 try:
-                    await self.order_manager.create_and_submit_close_pair_order(order_pair)
-                    for account in order_pair.accounts:
-                        del self.order_dict[f"{symbol}-{hex(account.account.address)}"]
+                    if await self.order_manager.create_and_submit_close_pair_order(order_pair) is None:
+                        raise Exception("close orders were not submitted")
+                    self.pairs.remove(order_pair)
 
                     logging.info(f"Closing position {symbol} for account {hex(account.account.address)} successfully")
                 except Exception as e:
                     logging.error(f"Failed to close position {symbol} for account {hex(account.account.address)}")
+                finally:
+                    self.closing_pairs.pop(order_pair.pair_id).set()
+                    if self.lease_manager:
+                        await self.lease_manager.release(counterparties)
         except Exception as e:
             logging.error(f"Error handling account balance for account {hex(account.account.address)}: {str(e)}")
 
 
-    def _update_order_dict(self, pair_order: PairOrder) -> None:
-        symbol = pair_order.symbol
-        to_be_updated = PairOrder(symbol)
-        for account in pair_order.accounts:
-            if f"{symbol}-{hex(account.account.address)}" not in self.order_dict:
-                continue
-            to_be_updated = self.order_dict[f"{symbol}-{hex(account.account.address)}"]
+    def _pair_is_open(self, pair_order: PairOrder) -> bool:
+        # Only the in-memory account streams are consulted; an account without a synced stream counts as open
         for account in pair_order.accounts:
-            to_be_updated.add_account(account)
-        for account in to_be_updated.accounts:
-            self.order_dict[f"{symbol}-{hex(account.account.address)}"] = to_be_updated
-
-    async def perform_cleanup(self) -> None:
-        cleanup_tasks = []
-        processed_pairs = set()
-        for account in self.accounts:
-            try:
-                await self.update_jwt(account)
-                # Cancel all open orders
-                await self.api_client.cancel_orders(account.jwt)
-                logging.info(f"Cancelled all open orders for account {hex(account.account.address)}")
-
-                # Close all open positions
-                positions = await self.api_client.get_positions(account.jwt)
-                for position in positions:
-                    if position["status"] != "OPEN":
-                        continue
-
-                    symbol = position["market"]
-                    order_key = f"{symbol}-{hex(account.account.address)}"
-                    if order_key not in self.order_dict:
-                        continue
-                    order_pair = self.order_dict[order_key]
-                    pair_key = f"{symbol}"
-                    for account in order_pair.accounts:
-                        pair_key += f"-{hex(account.account.address)}"
-                    if pair_key in processed_pairs:
-                        continue
-                    processed_pairs.add(pair_key)
-                    cleanup_tasks.append(
-                        self._close_position_pair(order_pair)
-                    )
+            snapshot = self.account_state.get_snapshot(account)
+            if snapshot is None:
+                return True
+            position = snapshot.positions.get(pair_order.symbol)
+            if position and position["status"] == "OPEN":
+                return True
+        return False
 
-            except Exception as e:
-                logging.error(f"Cleanup failed for account {hex(account.account.address)}, error: {str(e)}")
-        # Execute all cleanup tasks concurrently
-        await asyncio.gather(*cleanup_tasks)
-        logging.info("Cleanup completed successfully")
-
-    async def _close_position_pair(self, pair_order: PairOrder) -> None:
+    async def perform_cleanup(self) -> CleanupReport:
+        cleanup_engine = CleanupEngine(
+            self.api_client, self.order_manager, self.account_state, self.update_jwt,
+            concurrency=self.cleanup_concurrency, deadline=self.cleanup_deadline_seconds
+        )
         try:
-            await self.order_manager.create_and_submit_close_pair_order(pair_order)
-            for account in pair_order.accounts:
-                del self.order_dict[f"{pair_order.symbol}-{hex(account.account.address)}"]
-            accounts_str = [hex(account.account.address) for account in pair_order.accounts]
-            logging.info(f"Closing position {pair_order.symbol} for account {accounts_str} successfully")
-        except Exception as e:
-            accounts_str = [hex(account.account.address) for account in pair_order.accounts]
-            logging.error(f"Failed to close position {pair_order.symbol} for account {accounts_str}")
+            loop = asyncio.get_running_loop()
+            started_at = self.shutdown_requested_at or loop.time()
+            if loop.time() - started_at > 1:
+                logging.warning(f"Cleanup starts {loop.time() - started_at:.1f}s after the shutdown signal")
+            return await cleanup_engine.run(self.accounts, self.pairs, started_at + self.cleanup_deadline_seconds)
+        finally:
+            await self.pairs.stop()
+            await self.account_state.stop()
+            await self.market_data.stop()
+            await self.markets_registry.stop()
+            await self.jwt_manager.stop()
+            if self.api_client.reauth_count:
+                logging.info(
+                    f"Re-authenticated {self.api_client.reauth_count} times after 401, "
+                    f"{self.api_client.reauth_failures} failed"
+                )
+            await self.api_client.close()
+            self.signing_executor.shutdown(wait=False)
 
     async def run(self, shutdown_event) -> None:
-        while not shutdown_event.is_set():
-            # randomly select 2 accounts and open long and short orders
-            market = random.choice(self.markets)
-            size = random.randint(self.order_size_range[0], self.order_size_range[1])
-            long_account, short_account = random.sample(self.accounts, 2)
-            logging.info(f"Long Account: {hex(long_account.account.address)}, Short Account: {hex(short_account.account.address)}")
-            logging.info(f"market: {market}, size: {size}")
-
-            await self.update_jwt(long_account)
-            await self.update_jwt(short_account)
-            await self.handle_account_balance(long_account, size)
-            await self.handle_account_balance(short_account, size)
-
-            pair_order = await self.order_manager.create_and_submit_orders(
-                long_account,
-                short_account,
-                market,
-                size
-            )
-            if pair_order:
-                self._update_order_dict(pair_order)
+        self.lease_manager = AccountLeaseManager(self.accounts)
+        self.pairs.start(self._pair_is_open)
+        if self.pair_workers * 2 > len(self.accounts):
+            logging.warning(f"{self.pair_workers} pair workers need {self.pair_workers * 2} accounts, only {len(self.accounts)} loaded")
+        await asyncio.gather(
+            *[self._pair_worker(worker_id, shutdown_event) for worker_id in range(self.pair_workers)]
+        )
 
-            cool_down_time = random.randint(
-                self.cool_down_time_seconds_between_orders_range[0],
-                self.cool_down_time_seconds_between_orders_range[1]
-            )
-            logging.info(f"Cool down time: {cool_down_time} seconds")
-            try:
-                await asyncio.wait_for(
-                    shutdown_event.wait(),
-                    timeout=cool_down_time
+    async def _pair_worker(self, worker_id: int, shutdown_event) -> None:
+        prefetch: Optional[asyncio.Task] = None
+        try:
+            while not shutdown_event.is_set():
+                # The next pair is normally already prepared by the prefetch started during the last cooldown
+                if prefetch:
+                    shutdown_wait = asyncio.ensure_future(shutdown_event.wait())
+                    await asyncio.wait({prefetch, shutdown_wait}, return_when=asyncio.FIRST_COMPLETED)
+                    shutdown_wait.cancel()
+                    if not prefetch.done():
+                        # Cancelled and its lease released in the finally block below
+                        break
+                    next_pair = prefetch.result()
+                else:
+                    next_pair = await self._prepare_next_pair(worker_id)
+                prefetch = None
+                if next_pair is None:
+                    continue
+                leased, prepared = next_pair
+                if shutdown_event.is_set():
+                    # The signal arrived while preparing; opening a new hedge now would only eat into cleanup
+                    await self.lease_manager.release(leased)
+                    break
+                try:
+                    if prepared:
+                        await self._fire_pair(prepared)
+                except Exception as e:
+                    logging.error(f"[worker {worker_id}] Error creating and submitting orders: {str(e)}")
+                finally:
+                    await self.lease_manager.release(leased)
+
+                cool_down_time = random.randint(
+                    self.cool_down_time_seconds_between_orders_range[0],
+                    self.cool_down_time_seconds_between_orders_range[1]
                 )
-            except asyncio.TimeoutError:
-                pass
+                logging.info(f"[worker {worker_id}] Cool down time: {cool_down_time} seconds")
+                if self.prefetch_next_pair and not shutdown_event.is_set():
+                    prefetch = asyncio.create_task(self._prepare_next_pair(worker_id))
+                try:
+                    await asyncio.wait_for(
+                        shutdown_event.wait(),
+                        timeout=cool_down_time
+                    )
+                except asyncio.TimeoutError:
+                    pass
+        finally:
+            # Shutdown cleanup closes whatever the prefetch left open, so it is not worth waiting for
+            if prefetch:
+                prefetch.cancel()
+                next_pair, = await asyncio.gather(prefetch, return_exceptions=True)
+                if isinstance(next_pair, tuple):
+                    await self.lease_manager.release(next_pair[0])
+
+    async def _prepare_next_pair(
+            self,
+            worker_id: int
+    ) -> Optional[Tuple[Tuple[ParadexAccount, ParadexAccount], Optional[PreparedPair]]]:
+        # randomly select 2 free accounts and open long and short orders
+        leased = await self.lease_manager.acquire_pair(timeout=1)
+        if leased is None:
+            return None
+        long_account, short_account = leased
+        market = random.choice(self.markets)
+        size = random.randint(self.order_size_range[0], self.order_size_range[1])
+        logging.info(f"[worker {worker_id}] Long Account: {hex(long_account.account.address)}, Short Account: {hex(short_account.account.address)}")
+        logging.info(f"[worker {worker_id}] market: {market}, size: {size}")
+
+        try:
+            await self._check_accounts(leased, size)
+            prepared = await self.order_manager.prepare_pair_orders(long_account, short_account, market, size)
+        except asyncio.CancelledError:
+            await self.lease_manager.release(leased)
+            raise
+        except Exception as e:
+            logging.error(f"[worker {worker_id}] Error preparing orders for {market}: {str(e)}")
+            prepared = None
+        return leased, prepared
+
+    async def _check_accounts(self, accounts: Tuple[ParadexAccount, ...], required_value: int) -> None:
+        # Both legs are independent, so their tokens and balances are checked concurrently
+        results = await asyncio.gather(*[self.update_jwt(account) for account in accounts], return_exceptions=True)
+        failed = [(account, result) for account, result in zip(accounts, results) if isinstance(result, Exception)]
+        for account, error in failed:
+            logging.error(f"Failed to refresh JWT for account {hex(account.account.address)}: {str(error)}")
+        if failed:
+            raise Exception(f"No JWT for {len(failed)} of {len(accounts)} accounts")
+        await asyncio.gather(
+            *[self.handle_account_balance(account, required_value, accounts) for account in accounts]
+        )
 
+    async def _fire_pair(self, prepared: PreparedPair) -> None:
+        # Cache and stream hits unless a token expired or a fill landed during the cooldown
+        await self._check_accounts(prepared.accounts, prepared.value)
+        pair_order = await self.order_manager.submit_prepared_pair(prepared)
+        if pair_order:
+            self.pairs.add(pair_order)
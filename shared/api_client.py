@@ -9,12 +9,10 @@ import base64
 import hmac
 import json
 import logging
-import sys
 import time
-from typing import Dict, List, Tuple
+from typing import TYPE_CHECKING, Dict, List, Tuple
 
 import aiohttp
-import websockets
 from .api_client_utils import (
     DecimalEncoder,
     auth_message,
@@ -25,19 +23,18 @@ from .api_client_utils import (
     get_acc_contract_address_and_call_data,
     get_account,
     is_token_expired,
+    TokenExpired,
     onboarding_message,
     order_sign_message,
     stark_key_message,
 )
 from .api_config import ApiConfig
 from .paradex_api_utils import Order
-from starknet_py.common import int_from_bytes
-from starknet_py.contract import Contract
-from starknet_py.net.signer.stark_curve_signer import KeyPair
-from .starknet_utils import get_proxy_config
-from web3.auto import w3
 
-from helpers.account import Account
+if TYPE_CHECKING:
+    import websockets
+
+    from helpers.account import Account
 
 
 # RESToverHTTP Interface
@@ -296,8 +293,8 @@ def check_token_expiry(status_code: int, response: Dict) -> None:
     """
     if is_token_expired(status_code, response):
         logging.info(response["message"])
-        logging.error("Token has expired, please restart the bot.")
-        sys.exit(1)
+        # Raised rather than exiting so callers can re-authenticate and retry
+        raise TokenExpired(response["message"])
 
 
 async def post_order_payload(paradex_http_url: str, paradex_jwt: str, payload: dict) -> dict:
@@ -437,7 +434,7 @@ async def get_paradex_config(
 
 
 # JSON-RPCoverWebsocket Interface
-async def send_heartbeat_id(websocket: websockets.WebSocketClientProtocol, id: int) -> None:
+async def send_heartbeat_id(websocket: "websockets.WebSocketClientProtocol", id: int) -> None:
     """
     Sends a Heartbeat to keep the Paradex WebSocket connection alive.
     """
@@ -446,7 +443,7 @@ async def send_heartbeat_id(websocket: websockets.WebSocketClientProtocol, id: i
 
 
 async def send_auth_id(
-    websocket: websockets.WebSocketClientProtocol, paradex_jwt: str, msg_id: str
+    websocket: "websockets.WebSocketClientProtocol", paradex_jwt: str, msg_id: str
 ) -> None:
     """
     Sends an authentication message to the Paradex WebSocket.
@@ -464,7 +461,7 @@ async def send_auth_id(
 
 
 async def subscribe_channel_with_id(
-    websocket: websockets.WebSocketClientProtocol, channel: str, sub_id: int
+    websocket: "websockets.WebSocketClientProtocol", channel: str, sub_id: int
 ) -> None:
     """
     Subscribe to a named `` WS Channel.
@@ -481,7 +478,7 @@ async def subscribe_channel_with_id(
     )
 
 
-def starknet_account(config: ApiConfig) -> Account:
+def starknet_account(config: ApiConfig) -> "Account":
     if config.starknet_account is not None:
         return config.starknet_account
 
@@ -503,6 +500,10 @@ async def get_usdc_balance(config: ApiConfig) -> int:
 
 
 async def deposit_to_paraclear(config: ApiConfig, amount: int) -> None:
+    from starknet_py.contract import Contract
+
+    from .starknet_utils import get_proxy_config
+
     paraclear_address = config.paradex_config["paraclear_address"]
     account = starknet_account(config)
     paraclear_contract = await Contract.from_address(
@@ -536,6 +537,8 @@ async def deposit_to_paraclear(config: ApiConfig, amount: int) -> None:
 async def get_jwt_token(
     paradex_config: Dict, paradex_http_url: str, account_address: str, private_key: str
 ) -> str:
+    from starknet_py.common import int_from_bytes
+
     logging.info("get_jwt_token")
     token = ""
     chain = int_from_bytes(paradex_config["starknet_chain_id"].encode())
@@ -578,6 +581,8 @@ async def onboarding(
     private_key: str,
     ethereum_account: str,
 ) -> str:
+    from starknet_py.common import int_from_bytes
+
     chain = int_from_bytes(paradex_config["starknet_chain_id"].encode())
     print("chain", hex(chain))
     account = get_account(
@@ -636,6 +641,9 @@ def get_recovery_phrase(config: ApiConfig) -> str:
 
 
 def generate_accounts(config: ApiConfig):
+    from starknet_py.net.signer.stark_curve_signer import KeyPair
+    from web3.auto import w3
+
     if config.ethereum_private_key != "":
         w3.eth.account.enable_unaudited_hdwallet_features()
         account = w3.eth.account.from_key(config.ethereum_private_key)
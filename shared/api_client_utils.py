@@ -4,21 +4,16 @@ import logging
 import os
 from decimal import Decimal
 from enum import IntEnum
-from typing import Optional, Tuple
+from typing import TYPE_CHECKING, Optional, Tuple
 
-from eth_account.hdaccount import generate_mnemonic
-from eth_account.messages import encode_structured_data
 from .paradex_api_utils import Order
-from starknet_py.hash.address import compute_address
-from starknet_py.hash.selector import get_selector_from_name
-from starknet_py.net.full_node_client import FullNodeClient
-from starknet_py.common import int_from_bytes
-from starknet_py.net.signer.stark_curve_signer import KeyPair
-from starknet_py.utils.typed_data import TypedData
-from starkware.crypto.signature.signature import EC_ORDER
-from web3.auto import w3
+from starknet_py.constants import EC_ORDER
 
-from helpers.account import Account
+# Slow-to-import dependencies are imported inside the functions that use them
+if TYPE_CHECKING:
+    from starknet_py.utils.typed_data import TypedData
+
+    from helpers.account import Account
 
 
 class TokenExpired(Exception):
@@ -38,19 +33,27 @@ def is_token_expired(status_code: int, response: dict) -> bool:
         True
         if (
             status_code == 401
-            and response["message"].startswith("invalid bearer jwt: token is expired by")
+            and isinstance(response, dict)
+            and str(response.get("message", "")).startswith("invalid bearer jwt: token is expired by")
         )
         else False
     )
 
 
 def get_chain_id(chain_id: str):
+    from starknet_py.common import int_from_bytes
+
     class CustomStarknetChainId(IntEnum):
         PRIVATE_TESTNET = int_from_bytes(chain_id.encode("UTF-8"))
     return CustomStarknetChainId.PRIVATE_TESTNET
 
 
-def get_account(account_address: str, account_key: str, paradex_config: dict):
+def get_account(account_address: str, account_key: str, paradex_config: dict) -> "Account":
+    from starknet_py.net.full_node_client import FullNodeClient
+    from starknet_py.net.signer.stark_curve_signer import KeyPair
+
+    from helpers.starknet_account import Account
+
     client = FullNodeClient(node_url=paradex_config["starknet_fullnode_rpc_url"])
     key_pair = KeyPair.from_private_key(key=int(account_key, 16))
     chain = get_chain_id(paradex_config["starknet_chain_id"])
@@ -64,7 +67,7 @@ def get_account(account_address: str, account_key: str, paradex_config: dict):
 
 
 # Messages
-def auth_message(chainId: int, now: int, expiry: int) -> TypedData:
+def auth_message(chainId: int, now: int, expiry: int) -> "TypedData":
     message = {
         "message": {
             "method": "POST",
@@ -93,7 +96,7 @@ def auth_message(chainId: int, now: int, expiry: int) -> TypedData:
     return message
 
 
-def onboarding_message(chainId: int) -> TypedData:
+def onboarding_message(chainId: int) -> "TypedData":
     message = {
         "message": {
             "action": "Onboarding",
@@ -180,6 +183,9 @@ def flatten_signature(sig: list[str]) -> str:
 def get_acc_contract_address_and_call_data(
     proxy_contract_hash: str, account_class_hash: str, public_key: str
 ) -> str:
+    from starknet_py.hash.address import compute_address
+    from starknet_py.hash.selector import get_selector_from_name
+
     # call_data = {
     #     'implementation': account_class_hash,
     #     'selector': get_selector_from_name("initialize"),
@@ -209,6 +215,8 @@ def gen_and_save_recovery_phrase() -> str:
         with open("recovery_phrase.txt", "r") as f:
             recovery_phrase = f.read()
         return recovery_phrase
+    from eth_account.hdaccount import generate_mnemonic
+
     recovery_phrase = generate_mnemonic(lang="english", num_words=12)
     with open("recovery_phrase.txt", "w") as f:
         f.write(recovery_phrase)
@@ -223,6 +231,8 @@ def get_recovery_phrase_dict(config: dict) -> str:
 
 
 def generate_keys(menmonic: str, address_index: str) -> Optional[Tuple[str, str]]:
+    from web3.auto import w3
+
     w3.eth.account.enable_unaudited_hdwallet_features()
     account = w3.eth.account.from_mnemonic(
         menmonic, account_path=f"m/44'/60'/0'/0/{address_index}"
@@ -231,6 +241,9 @@ def generate_keys(menmonic: str, address_index: str) -> Optional[Tuple[str, str]
 
 
 def sign_stark_key_message(eth_private_key: int, stark_key_message) -> str:
+    from eth_account.messages import encode_structured_data
+    from web3.auto import w3
+
     w3.eth.account.enable_unaudited_hdwallet_features()
     encoded = encode_structured_data(primitive=stark_key_message)
     print("encoded", encoded)
@@ -301,6 +314,9 @@ def derive_stark_key_from_eth_key(msg: str, eth_private_key: str) -> int:
 
 def generate_accounts_dict(config: dict) -> dict:
     FN = "generate_accounts_dict"
+    from starknet_py.net.signer.stark_curve_signer import KeyPair
+    from web3.auto import w3
+
     if config.get("ethereum_private_key"):
         w3.eth.account.enable_unaudited_hdwallet_features()
         account = w3.eth.account.from_key(config.get("ethereum_private_key"))
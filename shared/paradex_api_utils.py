@@ -3,6 +3,7 @@ import statistics
 import time
 from decimal import Decimal
 from enum import Enum
+from typing import List, Optional
 
 
 def time_now_milli_secs() -> float:
@@ -134,6 +135,7 @@ class Order:
         client_id: str = "",
         signature_timestamp = None,
         instruction: str = "GTC",
+        flags: Optional[List[str]] = None,
     ):
         ts = time_millis()
         self.id: str = ""
@@ -155,6 +157,8 @@ class Order:
         self.signature = ""
         self.signature_timestamp = ts if signature_timestamp is None else signature_timestamp
         self.instruction = instruction
+        # Not part of the signed message, e.g. ["REDUCE_ONLY"]
+        self.flags = flags
 
     def __repr__(self):
         ord_status = self.status.value
@@ -189,6 +193,8 @@ class Order:
         }
         if self.order_type == OrderType.Limit:
             order_dict["price"] = str(self.limit_price)
+        if self.flags:
+            order_dict["flags"] = self.flags
 
         return order_dict
 
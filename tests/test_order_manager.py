@@ -0,0 +1,106 @@
+import asyncio
+import unittest
+from decimal import Decimal
+from types import SimpleNamespace
+from typing import List
+
+from order_manager import OrderManager, OrderSpec, PreparedPair
+from shared.paradex_api_utils import Order, OrderSide, OrderType
+
+MARKET = "BTC-USD-PERP"
+
+
+class FakeAccount:
+    def __init__(self, address: int):
+        self.account = SimpleNamespace(address=address)
+        self.jwt = f"jwt-{address}"
+
+
+class FakeAPIClient:
+    """Answers POST /orders from a scripted list of results; exceptions are raised as transport errors."""
+    batch_orders_supported = False
+
+    def __init__(self, results: List, lookup=None):
+        self.results = list(results)
+        self.lookup = lookup
+        self.posted: List[dict] = []
+
+    async def post_order(self, jwt: str, payload: dict) -> dict:
+        self.posted.append(payload)
+        result = self.results.pop(0)
+        if isinstance(result, Exception):
+            raise result
+        return result
+
+    async def get_order_by_client_id(self, jwt: str, client_id: str) -> dict:
+        if isinstance(self.lookup, Exception):
+            raise self.lookup
+        return self.lookup
+
+
+class UnsignedOrderManager(OrderManager):
+    async def _build_signed_orders(self, specs: List[OrderSpec]) -> List[Order]:
+        return [
+            Order(
+                market=spec.market,
+                order_type=spec.order_type,
+                order_side=spec.order_side,
+                size=spec.size,
+                client_id=spec.client_id,
+                flags=["REDUCE_ONLY"] if spec.reduce_only else None,
+            )
+            for spec in specs
+        ]
+
+
+class UnwindPartialPairTest(unittest.TestCase):
+    def setUp(self):
+        self.long_account = FakeAccount(1)
+        self.short_account = FakeAccount(2)
+
+    def submit(self, api_client: FakeAPIClient, order_manager: OrderManager = None):
+        order_manager = order_manager or UnsignedOrderManager(1, api_client, SimpleNamespace(get_bbo=lambda symbol: None, max_age=60))
+        specs = [
+            OrderSpec(self.long_account, OrderType.Market, OrderSide.Buy, Decimal("0.5"), MARKET),
+            OrderSpec(self.short_account, OrderType.Market, OrderSide.Sell, Decimal("0.5"), MARKET),
+        ]
+        prepared = PreparedPair(self.long_account, self.short_account, MARKET, 100, specs, order_manager.client_ids.next_seq())
+        return asyncio.run(order_manager.submit_prepared_pair(prepared))
+
+    def test_unresolved_leg_stays_tracked(self):
+        # The short leg times out and the exchange can't confirm it, with no position snapshot to check
+        api_client = FakeAPIClient([{"id": "1"}, asyncio.TimeoutError(), {"id": "2"}], lookup={"error": "NOT_FOUND"})
+        pair_order = self.submit(api_client)
+
+        unwinds = [payload for payload in api_client.posted if payload.get("flags") == ["REDUCE_ONLY"]]
+        self.assertEqual([(payload["side"], payload["size"]) for payload in unwinds], [("SELL", "0.5")])
+        self.assertIsNotNone(pair_order)
+        self.assertEqual(set(pair_order.addresses()), {self.short_account.account.address})
+
+    def test_confirmed_unfilled_leg_is_not_unwound(self):
+        # The short leg's POST fails, but the exchange reports it closed without filling
+        api_client = FakeAPIClient(
+            [{"id": "1"}, asyncio.TimeoutError(), {"id": "2"}],
+            lookup={"id": "3", "status": "CLOSED", "remaining_size": "0.5"},
+        )
+        pair_order = self.submit(api_client)
+
+        unwinds = [payload for payload in api_client.posted if payload.get("flags") == ["REDUCE_ONLY"]]
+        self.assertEqual([payload["side"] for payload in unwinds], ["SELL"])
+        self.assertIsNone(pair_order)
+
+    def test_failed_unwind_is_resent_only_when_absent(self):
+        rejected = {"error": "INSUFFICIENT_MARGIN"}
+        # The exchange never saw the unwind, so it is sent again
+        api_client = FakeAPIClient([{"id": "1"}, rejected, asyncio.TimeoutError(), {"id": "2"}], lookup={"error": "ORDER_ID_NOT_FOUND"})
+        self.assertIsNone(self.submit(api_client))
+        self.assertEqual(len([payload for payload in api_client.posted if payload.get("flags")]), 2)
+
+        # The exchange has the unwind, so resending it would reduce the account's position twice
+        api_client = FakeAPIClient([{"id": "1"}, rejected, asyncio.TimeoutError()], lookup={"id": "3", "status": "NEW"})
+        self.assertIsNone(self.submit(api_client))
+        self.assertEqual(len([payload for payload in api_client.posted if payload.get("flags")]), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,27 +1,31 @@
+import functools
 import hashlib
 from enum import IntEnum
-from typing import Dict, Tuple
-from eth_account.messages import encode_structured_data
-from web3.auto import w3
-from starknet_py.common import int_from_bytes
-from starknet_py.hash.address import compute_address
-from starknet_py.hash.selector import get_selector_from_name
-from starknet_py.net.full_node_client import FullNodeClient
-from starknet_py.net.signer.stark_curve_signer import KeyPair
-from starknet_py.utils.typed_data import TypedData
-from starkware.crypto.signature.signature import EC_ORDER
-from helpers.account import Account
-
-
-def build_auth_message(chainId: int, now: int, expiry: int) -> TypedData:
+from typing import TYPE_CHECKING, Dict, Tuple
+from starknet_py.constants import EC_ORDER
+from helpers.account import SignerAccount, StarkKeyPair
+
+if TYPE_CHECKING:
+    from helpers.account import Account
+
+
+def int_from_bytes(value: bytes) -> int:
+    return int.from_bytes(value, byteorder="big")
+
+
+def auth_request_message(now: int, expiry: int) -> Dict:
+    return {
+        "method": "POST",
+        "path": "/v1/auth",
+        "body": "",
+        "timestamp": now,
+        "expiration": expiry,
+    }
+
+
+def build_auth_message(chainId: int, now: int, expiry: int) -> Dict:
     message = {
-        "message": {
-            "method": "POST",
-            "path": "/v1/auth",
-            "body": "",
-            "timestamp": now,
-            "expiration": expiry,
-        },
+        "message": auth_request_message(now, expiry),
         "domain": {"name": "Paradex", "chainId": hex(chainId), "version": "1"},
         "primaryType": "Request",
         "types": {
@@ -41,7 +45,7 @@ def build_auth_message(chainId: int, now: int, expiry: int) -> TypedData:
     }
     return message
 
-def build_stark_key_message(chain_id: int) -> TypedData:
+def build_stark_key_message(chain_id: int) -> Dict:
     message = {
         "domain": {"name": "Paradex", "version": "1", "chainId": chain_id},
         "primaryType": "Constant",
@@ -63,8 +67,11 @@ def build_stark_key_message(chain_id: int) -> TypedData:
 
 
 def sign_stark_key_message(eth_private_key: int, stark_key_message) -> str:
+    from eth_account import Account as EthAccount
+    from eth_account.messages import encode_structured_data
+
     encoded = encode_structured_data(primitive=stark_key_message)
-    signed = w3.eth.account.sign_message(encoded, eth_private_key)
+    signed = EthAccount.sign_message(encoded, eth_private_key)
     return signed.signature.hex()
 
 
@@ -104,6 +111,9 @@ def derive_stark_key_from_eth_key(msg: str, eth_private_key: str) -> int:
 def get_acc_contract_address_and_call_data(
     proxy_contract_hash: str, account_class_hash: str, public_key: str
 ) -> str:
+    from starknet_py.hash.address import compute_address
+    from starknet_py.hash.selector import get_selector_from_name
+
     calldata = [
         int(account_class_hash, 16),
         get_selector_from_name("initialize"),
@@ -126,7 +136,7 @@ def generate_paradex_account(
     eth_chain_id = int(paradex_config['l1_chain_id'])
     stark_key_msg = build_stark_key_message(eth_chain_id)
     paradex_private_key = derive_stark_key_from_eth_key(stark_key_msg, eth_account_private_key_hex)
-    paradex_key_pair = KeyPair.from_private_key(paradex_private_key)
+    paradex_key_pair = StarkKeyPair.from_private_key(paradex_private_key)
     paradex_account_private_key_hex = hex(paradex_private_key)
     paradex_account_address = get_acc_contract_address_and_call_data(
         paradex_config['paraclear_account_proxy_hash'],
@@ -136,13 +146,18 @@ def generate_paradex_account(
     return paradex_account_address, paradex_account_private_key_hex
 
 
+@functools.lru_cache(maxsize=None)
 def get_chain_id(chain_id: str):
     class CustomStarknetChainId(IntEnum):
         PRIVATE_TESTNET = int_from_bytes(chain_id.encode("UTF-8"))
     return CustomStarknetChainId.PRIVATE_TESTNET
 
 
-def get_account(account_address: str, account_key: str, paradex_config: dict):
+def get_account(account_address: str, account_key: str, paradex_config: dict) -> "Account":
+    from starknet_py.net.full_node_client import FullNodeClient
+    from starknet_py.net.signer.stark_curve_signer import KeyPair
+    from helpers.starknet_account import Account
+
     client = FullNodeClient(node_url=paradex_config["starknet_fullnode_rpc_url"])
     key_pair = KeyPair.from_private_key(key=hex_to_int(account_key))
     chain = get_chain_id(paradex_config["starknet_chain_id"])
@@ -155,5 +170,14 @@ def get_account(account_address: str, account_key: str, paradex_config: dict):
     return account
 
 
+def get_signer_account(account_address: str, account_key: str, paradex_config: dict) -> SignerAccount:
+    return SignerAccount(
+        address=account_address,
+        key_pair=StarkKeyPair.from_private_key(hex_to_int(account_key)),
+        chain_id=get_chain_id(paradex_config["starknet_chain_id"]),
+        node_url=paradex_config.get("starknet_fullnode_rpc_url"),
+    )
+
+
 def hex_to_int(val: str):
     return int(val, 16)
@@ -0,0 +1,149 @@
+import asyncio
+import json
+import logging
+import random
+from typing import Dict, List, Optional
+from shared.api_client import send_auth_id, send_heartbeat_id, subscribe_channel_with_id
+
+
+def ws_url_from_http_url(paradex_http_url: str) -> str:
+    # https://api.testnet.paradex.trade/v1 -> wss://ws.api.testnet.paradex.trade/v1
+    return paradex_http_url.replace("https://", "wss://ws.", 1)
+
+
+class ParadexWSClient:
+    """
+    Reconnecting JSON-RPC websocket connection to Paradex.
+
+    Subclasses list their channels in `channels()` and handle pushed data in `on_message()`.
+    If `auth_token()` returns a JWT the connection is authenticated before subscribing.
+    `on_connect()` runs first on every connection and `on_subscribed()` runs once the server
+    has accepted the auth and every subscription, which is where state that may have been
+    missed is resynced. A refused or unanswered request drops the connection and reconnects.
+    """
+
+    def __init__(
+            self,
+            ws_url: str,
+            heartbeat_period: float = 3,
+            reconnect_delay: float = 1,
+            max_reconnect_delay: float = 30,
+            response_timeout: float = 10
+    ):
+        self.ws_url = ws_url
+        self.heartbeat_period = heartbeat_period
+        self.reconnect_delay = reconnect_delay
+        self.max_reconnect_delay = max_reconnect_delay
+        self.response_timeout = response_timeout
+        self.connected = False
+        self._msg_id = 0
+        self._task: Optional[asyncio.Task] = None
+
+    def channels(self) -> List[str]:
+        return []
+
+    def auth_token(self) -> Optional[str]:
+        return None
+
+    async def on_connect(self, websocket) -> None:
+        pass
+
+    async def on_subscribed(self) -> None:
+        pass
+
+    async def on_disconnect(self) -> None:
+        pass
+
+    async def on_message(self, channel: str, data: Dict) -> None:
+        pass
+
+    def next_id(self) -> int:
+        self._msg_id += 1
+        return self._msg_id
+
+    def start(self) -> None:
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    async def _run(self) -> None:
+        import websockets
+
+        delay = self.reconnect_delay
+        while True:
+            try:
+                async with websockets.connect(self.ws_url) as websocket:
+                    await self.on_connect(websocket)
+                    request_ids = []
+                    token = self.auth_token()
+                    if token:
+                        request_ids.append(self.next_id())
+                        await send_auth_id(websocket, token, request_ids[-1])
+                    for channel in self.channels():
+                        request_ids.append(self.next_id())
+                        await subscribe_channel_with_id(websocket, channel, request_ids[-1])
+                    await asyncio.wait_for(self._await_responses(websocket, request_ids), self.response_timeout)
+                    self.connected = True
+                    delay = self.reconnect_delay
+                    await self.on_subscribed()
+                    heartbeat = asyncio.create_task(self._heartbeat(websocket))
+                    try:
+                        async for raw in websocket:
+                            await self._dispatch(raw)
+                    finally:
+                        heartbeat.cancel()
+            except asyncio.CancelledError:
+                raise
+            except asyncio.TimeoutError:
+                logging.warning(f"Websocket {self.ws_url} did not answer auth/subscribe within {self.response_timeout}s")
+            except Exception as e:
+                logging.warning(f"Websocket {self.ws_url} error: {str(e)}")
+            finally:
+                if self.connected:
+                    self.connected = False
+                    await self.on_disconnect()
+            # Jittered so streams dropped by the same outage don't all reconnect and resync together
+            wait = delay * random.uniform(0.5, 1.5)
+            logging.info(f"Reconnecting to {self.ws_url} in {wait:.1f}s")
+            await asyncio.sleep(wait)
+            delay = min(delay * 2, self.max_reconnect_delay)
+
+    async def _heartbeat(self, websocket) -> None:
+        while True:
+            await asyncio.sleep(self.heartbeat_period)
+            await send_heartbeat_id(websocket, self.next_id())
+
+    async def _await_responses(self, websocket, request_ids: List[int]) -> None:
+        pending = set(request_ids)
+        while pending:
+            message = json.loads(await websocket.recv())
+            if message.get("id") not in pending:
+                await self._handle(message)
+                continue
+            if "error" in message:
+                raise Exception(f"request {message['id']} was refused: {message['error']}")
+            pending.discard(message["id"])
+
+    async def _dispatch(self, raw: str) -> None:
+        await self._handle(json.loads(raw))
+
+    async def _handle(self, message: Dict) -> None:
+        if "error" in message:
+            logging.warning(f"Websocket {self.ws_url} error response: {message['error']}")
+            return
+        if message.get("method") != "subscription":
+            return
+        params = message["params"]
+        try:
+            await self.on_message(params["channel"], params["data"])
+        except Exception as e:
+            logging.error(f"Failed to handle {params['channel']} message: {str(e)}")